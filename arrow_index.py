@@ -0,0 +1,226 @@
+# spatial index for the arrow drawing example
+# every arrow is registered in the cells of a uniform grid that its line passes through,
+# hit tests and box queries only look at the arrows in the few cells around them instead of all arrows
+# the index also knows which cells are in view, so arrows outside the scrolled window can be hidden
+
+from collections import defaultdict
+import math
+
+class ArrowIndex:
+    """Uniform grid of line segments (the arrows) by key, e.g. the item id of the drawn arrow.
+    A segment is registered in every cell its line crosses, long arrows only cost cells along their line.
+    """
+
+    def __init__(self, cell_size=32):
+        """
+        Args:
+            cell_size (int, optional): width and height of a grid cell in pixels. Defaults to 32.
+        """
+        self.cell_size = cell_size
+        # key -> (x1, y1, x2, y2)
+        self._segments = {}
+        # (column, row) -> keys of the segments crossing the cell
+        self._cells = defaultdict(list)
+        # cells in view and the number of cells in view of every visible key, None until set_view() is called
+        self._view = None
+        self._visible = {}
+
+    def __len__(self):
+        return len(self._segments)
+
+    def __contains__(self, key):
+        return key in self._segments
+
+    def segment(self, key):
+        """End points ((x1, y1), (x2, y2)) of a segment."""
+        x1, y1, x2, y2 = self._segments[key]
+        return (x1, y1), (x2, y2)
+
+    def _cover(self, x1, y1, x2, y2):
+        """Cells crossed by the line from (x1, y1) to (x2, y2), column by column."""
+        size = self.cell_size
+        left, right = min(x1, x2), max(x1, x2)
+        cells = []
+        for column in range(math.floor(left / size), math.floor(right / size) + 1):
+            if x1 == x2:
+                top, bottom = min(y1, y2), max(y1, y2)
+            else:
+                # the part of the line inside this column
+                slope = (y2 - y1) / (x2 - x1)
+                ya = y1 + (max(left, column * size) - x1) * slope
+                yb = y1 + (min(right, (column + 1) * size) - x1) * slope
+                top, bottom = min(ya, yb), max(ya, yb)
+            for row in range(math.floor(top / size), math.floor(bottom / size) + 1):
+                cells.append((column, row))
+        return cells
+
+    def _box_cells(self, x0, y0, x1, y1):
+        """Cells overlapping the box from (x0, y0) to (x1, y1), x0 <= x1 and y0 <= y1."""
+        size = self.cell_size
+        return [(column, row)
+                for column in range(math.floor(x0 / size), math.floor(x1 / size) + 1)
+                for row in range(math.floor(y0 / size), math.floor(y1 / size) + 1)]
+
+    def insert(self, key, p1, p2):
+        """Add a segment.
+
+        Args:
+            key (obj): hashable key, not in the index yet
+            p1 ((float, float)): first end point
+            p2 ((float, float)): second end point
+
+        Returns:
+            bool: True if the segment is in view (always before set_view() is called)
+        """
+        segment = (p1[0], p1[1], p2[0], p2[1])
+        self._segments[key] = segment
+        in_view = 0
+        for cell in self._cover(*segment):
+            self._cells[cell].append(key)
+            if self._view is not None and cell in self._view:
+                in_view += 1
+        if in_view:
+            self._visible[key] = in_view
+        return self._view is None or in_view > 0
+
+    def remove(self, key):
+        """Remove a segment.
+
+        Args:
+            key (obj): key of the segment
+        """
+        for cell in self._cover(*self._segments.pop(key)):
+            keys = self._cells[cell]
+            keys.remove(key)
+            if not keys:
+                del self._cells[cell]
+        self._visible.pop(key, None)
+
+    def clear(self):
+        """Remove all segments, the view stays."""
+        self._segments.clear()
+        self._cells.clear()
+        self._visible.clear()
+
+    def near(self, point, radius):
+        """Find the segments passing within radius of a point.
+
+        Args:
+            point ((float, float)): position, e.g. of the mouse
+            radius (float): distance in pixels
+
+        Returns:
+            [(float, obj)]: distance and key of every segment within radius, nearest first
+        """
+        x, y = point
+        candidates = set()
+        for cell in self._box_cells(x - radius, y - radius, x + radius, y + radius):
+            candidates.update(self._cells.get(cell, ()))
+        found = []
+        for key in candidates:
+            x1, y1, x2, y2 = self._segments[key]
+            # closest point of the segment, projected and clamped to the end points
+            dx = x2 - x1
+            dy = y2 - y1
+            length = dx * dx + dy * dy
+            t = min(max(((x - x1) * dx + (y - y1) * dy) / length, 0.0), 1.0) if length else 0.0
+            distance = math.hypot(x - x1 - t * dx, y - y1 - t * dy)
+            if distance <= radius:
+                found.append((distance, key))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, point, radius):
+        """Key of the segment nearest to a point within radius, None if there is none."""
+        found = self.near(point, radius)
+        return found[0][1] if found else None
+
+    def in_box(self, p1, p2):
+        """Find the segments touching a box.
+
+        Args:
+            p1 ((float, float)): one corner of the box
+            p2 ((float, float)): opposite corner of the box
+
+        Returns:
+            set: keys of the segments inside or crossing the box
+        """
+        x0, x1 = min(p1[0], p2[0]), max(p1[0], p2[0])
+        y0, y1 = min(p1[1], p2[1]), max(p1[1], p2[1])
+        size = self.cell_size
+        found = set()
+        candidates = set()
+        for cell in self._box_cells(x0, y0, x1, y1):
+            keys = self._cells.get(cell)
+            if not keys:
+                continue
+            # every segment crossing a cell that lies completely inside the box touches the box
+            if cell[0] * size >= x0 and (cell[0] + 1) * size <= x1 and cell[1] * size >= y0 and (cell[1] + 1) * size <= y1:
+                found.update(keys)
+            else:
+                candidates.update(keys)
+        for key in candidates - found:
+            if _clips(self._segments[key], x0, y0, x1, y1):
+                found.add(key)
+        return found
+
+    def set_view(self, p1, p2):
+        """Set the visible part of the drawing. Only the cells entering or leaving the view are looked at,
+        so scrolling by a few pixels costs next to nothing.
+
+        Args:
+            p1 ((float, float)): top left corner of the view
+            p2 ((float, float)): bottom right corner of the view
+
+        Returns:
+            ([obj], [obj]): keys that became visible and keys that are not visible anymore
+        """
+        view = set(self._box_cells(p1[0], p1[1], p2[0], p2[1]))
+        if self._view is None:
+            # everything was visible so far, count from scratch
+            self._view = view
+            self._visible.clear()
+            for cell in view:
+                for key in self._cells.get(cell, ()):
+                    self._visible[key] = self._visible.get(key, 0) + 1
+            return [], [key for key in self._segments if key not in self._visible]
+        shown = []
+        hidden = []
+        # entering cells first, so a visible key that moves from one cell to the next never drops to 0
+        for cell in view - self._view:
+            for key in self._cells.get(cell, ()):
+                count = self._visible.get(key, 0)
+                if not count:
+                    shown.append(key)
+                self._visible[key] = count + 1
+        for cell in self._view - view:
+            for key in self._cells.get(cell, ()):
+                count = self._visible[key] - 1
+                if count:
+                    self._visible[key] = count
+                else:
+                    del self._visible[key]
+                    hidden.append(key)
+        self._view = view
+        return shown, hidden
+
+def _clips(segment, x0, y0, x1, y1):
+    """True if the segment (x1, y1, x2, y2) touches the box, by clipping its line to the box (Liang-Barsky)."""
+    sx, sy, ex, ey = segment
+    dx = ex - sx
+    dy = ey - sy
+    low, high = 0.0, 1.0
+    for p, q in ((-dx, sx - x0), (dx, x1 - sx), (-dy, sy - y0), (dy, y1 - sy)):
+        if p == 0:
+            # parallel to this edge, outside of it
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                low = max(low, t)
+            else:
+                high = min(high, t)
+            if low > high:
+                return False
+    return True
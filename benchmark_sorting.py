@@ -0,0 +1,103 @@
+# headless benchmark for the sorting algorithms of the plot sorting example
+# runs every registered algorithm on different sizes and input distributions without any UI
+# and records wall time, comparisons, swaps, writes and peak memory to CSV and/or JSON
+#
+# example: python benchmark_sorting.py --sizes 100 1000 100000 --csv results.csv
+
+import argparse
+import csv
+import json
+import time
+import tracemalloc
+import sorting
+
+# columns of a result row, in the order they are written to CSV
+FIELDS = ["algorithm", "distribution", "size", "seconds", "comparisons", "swaps", "writes", "peak_memory_bytes", "sorted"]
+
+def run_benchmark(name, values, measure_memory=True):
+    """Run one algorithm once on a copy of values.
+    Time and memory are measured in separate runs, tracemalloc would otherwise slow down the timed run.
+
+    Args:
+        name (str): name of the algorithm in sorting.ALGORITHMS
+        values (numpy.ndarray): values to sort
+        measure_memory (bool, optional): whether to do the second run for peak memory. Defaults to True.
+
+    Returns:
+        dict: result row with the keys of FIELDS
+    """
+    algorithm = sorting.ALGORITHMS[name]
+
+    # timed run, only the algorithm itself is measured
+    listy = values.tolist()
+    counter = sorting.OperationCounter()
+    stime = time.perf_counter()
+    algorithm.function(listy, counter)
+    seconds = time.perf_counter() - stime
+
+    # memory run, the copy of the input is allocated before tracing starts
+    peak = None
+    if measure_memory:
+        listy_memory = values.tolist()
+        tracemalloc.start()
+        algorithm.function(listy_memory, sorting.OperationCounter())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "algorithm": name,
+        "distribution": None,
+        "size": len(values),
+        "seconds": seconds,
+        "comparisons": counter.comparisons,
+        "swaps": counter.swaps,
+        "writes": counter.writes,
+        "peak_memory_bytes": peak,
+        "sorted": all(listy[i] <= listy[i + 1] for i in range(len(listy) - 1)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms of plot-sorting-algorithm.py without a display.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="input sizes to benchmark (default: 100 1000 10000 100000)")
+    parser.add_argument("--distributions", nargs="+", choices=sorting.DISTRIBUTIONS, default=sorting.DISTRIBUTIONS,
+                        help="input distributions to benchmark (default: all)")
+    parser.add_argument("--algorithms", nargs="+", choices=list(sorting.ALGORITHMS), default=list(sorting.ALGORITHMS),
+                        metavar="ALGORITHM", help="algorithms to benchmark (default: all)")
+    parser.add_argument("--quadratic-limit", type=int, default=10000,
+                        help="skip O(n^2) algorithms above this size (default: 10000)")
+    parser.add_argument("--min", type=int, default=0, help="smallest generated value (default: 0)")
+    parser.add_argument("--max", type=int, default=100, help="biggest generated value (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated values (default: 0)")
+    parser.add_argument("--skip-memory", action="store_true", help="do not measure peak memory, halves the run time")
+    parser.add_argument("--csv", help="write the results to this CSV file")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'algorithm':<22}{'distribution':<14}{'size':>10}{'seconds':>12}{'comparisons':>14}{'swaps':>12}{'writes':>12}{'peak memory':>14}")
+    for size in args.sizes:
+        for distribution in args.distributions:
+            # every algorithm gets exactly the same input
+            values = sorting.generate_values(size, distribution, args.min, args.max, args.seed)
+            for name in args.algorithms:
+                if sorting.ALGORITHMS[name].quadratic and size > args.quadratic_limit:
+                    continue
+                result = run_benchmark(name, values, not args.skip_memory)
+                result["distribution"] = distribution
+                results.append(result)
+                peak = "-" if result["peak_memory_bytes"] is None else result["peak_memory_bytes"]
+                print(f"{name:<22}{distribution:<14}{size:>10}{result['seconds']:>12.4f}{result['comparisons']:>14}"
+                      f"{result['swaps']:>12}{result['writes']:>12}{peak:>14}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(results, json_file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# level-of-detail decimation for the plot sorting example
+# a 1200 px wide plot cannot show a million points, so only the minimum and maximum
+# of every pixel column inside the visible x range are sent to Dear PyGui
+
+from collections import OrderedDict
+import numpy as np
+
+def visible_range(x, x_min, x_max):
+    """Find the indices of the points inside the visible x range.
+
+    Args:
+        x (numpy.ndarray): ascending x values
+        x_min (float): left edge of the plot
+        x_max (float): right edge of the plot
+
+    Returns:
+        (int, int): first index and index after the last visible point
+    """
+    return int(np.searchsorted(x, x_min, "left")), int(np.searchsorted(x, x_max, "right"))
+
+def decimate_minmax(x, y, lo, hi, columns):
+    """Reduce the points lo to hi to the minimum and maximum of each of columns buckets.
+    Keeps the shape of the data intact, spikes inside a bucket stay visible.
+    If there are not more points than the result would have, the points are returned as they are.
+
+    Args:
+        x (numpy.ndarray): ascending x values
+        y (numpy.ndarray): y values
+        lo (int): first index to include
+        hi (int): index after the last point to include
+        columns (int): number of buckets, usually the plot width in pixels
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray): decimated x and y values
+    """
+    count = hi - lo
+    if count <= 2 * columns:
+        return x[lo:hi], y[lo:hi]
+
+    # bucket start indices relative to lo, every bucket has at least two points
+    starts = (np.arange(columns) * count) // columns
+    visible = y[lo:hi]
+    out_x = np.empty(2 * columns + 1)
+    out_y = np.empty(2 * columns + 1)
+    # min and max of a bucket share the x value of the bucket start
+    out_x[0:-1:2] = x[lo + starts]
+    out_x[1:-1:2] = x[lo + starts]
+    out_y[0:-1:2] = np.minimum.reduceat(visible, starts)
+    out_y[1:-1:2] = np.maximum.reduceat(visible, starts)
+    # keep the last point, so the decimated series spans the same range
+    out_x[-1] = x[hi - 1]
+    out_y[-1] = y[hi - 1]
+    return out_x, out_y
+
+class DecimationCache:
+    """Small LRU cache of decimated series, one entry per data version and zoom level.
+    Zooming back and forth or panning over the same ranges does not recompute anything.
+    """
+
+    def __init__(self, size=32):
+        """
+        Args:
+            size (int, optional): number of decimated series to keep. Defaults to 32.
+        """
+        self.size = size
+        self._entries = OrderedDict()
+
+    def get(self, key, x, y, x_min, x_max, columns):
+        """Get the decimated series for the visible range, computing it if not cached.
+
+        Args:
+            key (obj): identifies the data, must change whenever x or y change
+            x (numpy.ndarray): ascending x values
+            y (numpy.ndarray): y values
+            x_min (float): left edge of the plot
+            x_max (float): right edge of the plot
+            columns (int): plot width in pixels
+
+        Returns:
+            [numpy.ndarray, numpy.ndarray]: decimated x and y values, ready for dpg.set_value()
+        """
+        lo, hi = visible_range(x, x_min, x_max)
+        # the visible index range identifies the zoom level
+        entry_key = (key, lo, hi, columns)
+        if entry_key in self._entries:
+            self._entries.move_to_end(entry_key)
+            return self._entries[entry_key]
+        entry = list(decimate_minmax(x, y, lo, hi, columns))
+        self._entries[entry_key] = entry
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,222 @@
+# recursive disk usage index for the file dialog example
+# a directory tree is walked by a pool of worker threads, the size and file count of every
+# directory (with and without its subdirectories) is stored in a SQLite database
+# when the tree is indexed again, directories whose modification time did not change are taken
+# from the database with a single stat instead of listing them again
+#
+# note: a directory's modification time only changes when entries are added, removed or renamed,
+# files that grow in place are picked up once something else in their directory changes
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import os
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER,
+    own_size INTEGER,
+    own_files INTEGER,
+    total_size INTEGER,
+    total_files INTEGER
+);
+CREATE INDEX IF NOT EXISTS directories_parent ON directories (parent);
+"""
+
+def connect(database):
+    """Open the index database, creating the table if needed.
+
+    Args:
+        database (str): path of the SQLite file
+
+    Returns:
+        sqlite3.Connection: connection, only to be used by the calling thread
+    """
+    connection = sqlite3.connect(database)
+    connection.executescript(SCHEMA)
+    return connection
+
+def _subtree(root):
+    """SQL condition and parameters for root and every path below it.
+    Paths below root sort between root + "/" and root + "0", since "0" follows "/" directly.
+    """
+    root = root.rstrip(os.sep) or os.sep
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    return "(path = ? OR (path >= ? AND path < ?))", (root, prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+
+def directory(connection, path):
+    """Indexed totals of one directory.
+
+    Args:
+        connection (sqlite3.Connection): connection from connect()
+        path (str): directory
+
+    Returns:
+        (int, int, int, int): own size, own files, total size and total files, None if not indexed
+    """
+    return connection.execute("SELECT own_size, own_files, total_size, total_files FROM directories WHERE path = ?",
+                              (path,)).fetchone()
+
+def children(connection, path):
+    """Indexed subdirectories of a directory, biggest first.
+
+    Args:
+        connection (sqlite3.Connection): connection from connect()
+        path (str): directory
+
+    Returns:
+        [(str, int, int)]: path, total size and total files of every subdirectory
+    """
+    return connection.execute("SELECT path, total_size, total_files FROM directories WHERE parent = ? "
+                              "ORDER BY total_size DESC", (path,)).fetchall()
+
+def format_size(size):
+    """Format a size in bytes with a binary unit.
+
+    Args:
+        size (int): size in bytes
+
+    Returns:
+        str: size like "1.5 GiB"
+    """
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if size < 1024 or unit == "TiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def _visit(path, known, known_children):
+    """Worker function, gets the own size, file count and subdirectories of one directory.
+    Unchanged directories are answered from the previous index with one stat.
+
+    Returns:
+        (int, int, int, [str], bool): mtime, own size, own files, subdirectories, True if reused
+    """
+    mtime = os.stat(path).st_mtime_ns
+    previous = known.get(path)
+    if previous is not None and previous[0] == mtime:
+        return mtime, previous[1], previous[2], known_children[path], True
+    own_size = 0
+    own_files = 0
+    subdirs = []
+    with os.scandir(path) as iterator:
+        for entry in iterator:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    own_size += entry.stat(follow_symlinks=False).st_size
+                    own_files += 1
+            except OSError:
+                pass
+    return mtime, own_size, own_files, subdirs, False
+
+class DiskUsageIndexer(threading.Thread):
+    """Indexes a directory tree into a database created by connect(), on a background thread.
+    Directories are listed in parallel by a thread pool, os.scandir and os.stat release the GIL.
+    """
+
+    def __init__(self, root, database, workers=8):
+        """
+        Args:
+            root (str): top directory of the tree
+            database (str): path of the SQLite file
+            workers (int, optional): number of directories listed at the same time. Defaults to 8.
+        """
+        super().__init__(daemon=True)
+        self.root = os.path.abspath(root)
+        self.database = database
+        self.workers = workers
+        # progress: directories listed, directories taken from the index, directories that failed
+        self.scanned = 0
+        self.reused = 0
+        self.errors = 0
+        self.error = None
+        self.finished = False
+        self._cancelled = False
+
+    @property
+    def done(self):
+        return self.finished
+
+    def cancel(self):
+        """Stop indexing, the database keeps the previous index."""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            connection = connect(self.database)
+            try:
+                self._index(connection)
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error) as error:
+            self.error = error
+        finally:
+            self.finished = True
+
+    def _index(self, connection):
+        # previous index of the tree
+        condition, parameters = _subtree(self.root)
+        known = {}
+        known_children = defaultdict(list)
+        for path, parent, mtime, own_size, own_files, total_size, total_files in connection.execute(
+                f"SELECT path, parent, mtime_ns, own_size, own_files, total_size, total_files FROM directories WHERE {condition}",
+                parameters):
+            known[path] = (mtime, own_size, own_files, total_size, total_files)
+            known_children[parent].append(path)
+
+        # walk the tree, every finished directory submits its subdirectories
+        results = {}
+        with ThreadPoolExecutor(self.workers) as pool:
+            pending = {pool.submit(_visit, self.root, known, known_children): (self.root, os.path.dirname(self.root))}
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                if self._cancelled:
+                    for future in pending:
+                        future.cancel()
+                    return
+                for future in finished:
+                    path, parent = pending.pop(future)
+                    try:
+                        mtime, own_size, own_files, subdirs, reused = future.result()
+                    except OSError:
+                        self.errors += 1
+                        continue
+                    if reused:
+                        self.reused += 1
+                    else:
+                        self.scanned += 1
+                    results[path] = [parent, mtime, own_size, own_files, own_size, own_files]
+                    for subdir in subdirs:
+                        pending[pool.submit(_visit, subdir, known, known_children)] = (subdir, path)
+        if self.root not in results:
+            raise OSError(f"cannot read {self.root}")
+
+        # add up the totals from the deepest directories to the root
+        for path in sorted(results, key=lambda path: path.count(os.sep), reverse=True):
+            row = results[path]
+            parent = results.get(row[0])
+            if parent is not None and path != self.root:
+                parent[4] += row[4]
+                parent[5] += row[5]
+
+        # replace the tree in the index, directories that are gone disappear with it
+        with connection:
+            connection.execute(f"DELETE FROM directories WHERE {condition}", parameters)
+            connection.executemany("INSERT INTO directories VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   ((path, *row) for path, row in results.items()))
+            # directories above the root that were indexed before include the root's change
+            previous = known.get(self.root)
+            if previous is not None:
+                size_change = results[self.root][4] - previous[3]
+                files_change = results[self.root][5] - previous[4]
+                path = self.root
+                ancestor = os.path.dirname(path)
+                while ancestor != path and directory(connection, ancestor) is not None:
+                    connection.execute("UPDATE directories SET total_size = total_size + ?, total_files = total_files + ? "
+                                       "WHERE path = ?", (size_change, files_change, ancestor))
+                    path = ancestor
+                    ancestor = os.path.dirname(path)
@@ -1,8 +1,19 @@
 # Dear PyGui basic arrow drawing example
-# drawing arrows on click and every frame
+# drawing arrows on click, a preview arrow follows the mouse and is only changed when the mouse moves
+# every arrow is kept in a spatial index to select and erase arrows and to hide the arrows outside the window
 
 import dearpygui.dearpygui as dpg
 import random
+import time
+import arrow_index
+
+# tools of the tool window
+TOOLS = ["draw", "select", "box select", "erase"]
+# pixels around the mouse that still hit an arrow when selecting and the radius of the eraser
+HIT_TOLERANCE = 8
+ERASER_RADIUS = 20
+# color of selected arrows
+SELECTED_COLOR = (255, 255, 255, 255)
 
 # create context
 dpg.create_context()
@@ -14,6 +25,22 @@ dpg.create_viewport(title="drawing arrows example")
 mouse_mark_pos = (0, 0)
 mouse_mark = False
 mouse_mark_circle = None
+# color of the arrow being drawn, chosen with the first click
+mouse_mark_color = None
+# the preview arrow from the mouse to the mark, created once and hidden while there is no mark
+preview_arrow = None
+# mouse position the preview arrow currently points from
+preview_pos = None
+# all finished arrows: color by item id, and their lines in a spatial index by item id
+arrows = {}
+index = arrow_index.ArrowIndex()
+# item ids of the selected arrows
+selection = set()
+# corner where the selection box started, None if no box is being drawn, and the box item
+box_start = None
+box_rect = None
+# visible part of the drawing (scroll position and window size) the arrows were last culled for
+view = None
 
 # calculate mouse coordinates
 def get_mouse_coords():
@@ -24,8 +51,7 @@ def get_mouse_coords():
         (float, float): tuple with mousex and mousey
     """
     # get mouse position from dearpygui
-    mousex = dpg.get_mouse_pos(local=False)[0]
-    mousey = dpg.get_mouse_pos(local=False)[1]
+    mousex, mousey = dpg.get_mouse_pos(local=False)
     # add scroll offset to get actual mouse coordinates on screen
     mousex += dpg.get_x_scroll("mainwindow")
     mousey += dpg.get_y_scroll("mainwindow")
@@ -34,20 +60,44 @@ def get_mouse_coords():
 
 def click_handler():
     """handler for click events
-    Marks a position when clicked and draws an arrow when clicked again.
+    Depending on the tool: marks a position when clicked and draws an arrow when clicked again,
+    selects the arrow under the mouse, starts a selection box or erases the arrows under the mouse.
+    Clicks into the tool window are ignored.
     """
     global mouse_mark_pos       # position (float, float) of the mouse when first clicked
     global mouse_mark           # flag (bool) wether a mark is set or not
     global mouse_mark_circle    # UUID (int) of the dpg-circle that is drawn when first clicked
+    global mouse_mark_color     # color (int, int, int, int) of the arrow being drawn
+    global preview_pos          # position (float, float) the preview arrow points from
+    global box_start            # corner (float, float) of the selection box
+
+    if dpg.is_item_hovered("tools"):
+        return
+    tool = dpg.get_value("tool")
+    if tool == "select":
+        # the arrow nearest to the mouse, clicking next to all arrows clears the selection
+        stime = time.perf_counter()
+        key = index.nearest(get_mouse_coords(), HIT_TOLERANCE)
+        set_selection({key} if key is not None else set(), time.perf_counter() - stime)
+        return
+    if tool == "box select":
+        # the box follows the mouse until the button is released, see release_handler()
+        box_start = get_mouse_coords()
+        dpg.configure_item(box_rect, pmin=box_start, pmax=box_start, show=True)
+        return
+    if tool == "erase":
+        erase_arrows(get_mouse_coords())
+        return
 
     # if the mouse has already been clicked before and there is a circle currently
     if mouse_mark:
-        # draw an arrow from the previously marked position to the current position in a random color
-        dpg.draw_arrow(get_mouse_coords(), mouse_mark_pos, thickness=4, color=random_color(), parent="mainwindow")
+        # draw an arrow from the previously marked position to the current position in the color of the preview
+        add_arrow(get_mouse_coords(), mouse_mark_pos, mouse_mark_color)
         # set the mouse flag to not clicked
         mouse_mark = False
-        # remove marking circle by deleting the dpg-item
+        # remove marking circle by deleting the dpg-item and hide the preview until the next mark
         dpg.delete_item(mouse_mark_circle)
+        dpg.hide_item(preview_arrow)
     else:
         # this is the first click performed
         # remember the mouse coordinates
@@ -56,6 +106,144 @@ def click_handler():
         mouse_mark = True
         # draw a circle at the marked position
         mouse_mark_circle = dpg.draw_circle(mouse_mark_pos, 10, color=(255, 0, 0, 255), fill=(255, 0, 0, 255), parent="mainwindow")
+        # show the preview arrow from the mark in a new random color
+        mouse_mark_color = random_color()
+        preview_pos = mouse_mark_pos
+        dpg.configure_item(preview_arrow, p1=mouse_mark_pos, p2=mouse_mark_pos, color=mouse_mark_color, show=True)
+
+def update_preview():
+    """called once per rendered frame
+    Points the preview arrow to the mouse while a mark is set, the arrow is only changed
+    when the mouse position (including the scrolling of the window) differs from the last frame.
+    """
+    global preview_pos
+    if not mouse_mark:
+        return
+    mouse_pos = get_mouse_coords()
+    if mouse_pos != preview_pos:
+        dpg.configure_item(preview_arrow, p1=mouse_pos)
+        preview_pos = mouse_pos
+
+def cancel_mark():
+    """Removes the marking circle and hides the preview arrow, e.g. when another tool is chosen."""
+    global mouse_mark
+    if mouse_mark:
+        mouse_mark = False
+        dpg.delete_item(mouse_mark_circle)
+        dpg.hide_item(preview_arrow)
+
+def add_arrow(p1, p2, color):
+    """Draw a finished arrow and add it to the index.
+
+    Args:
+        p1 ((float, float)): position the arrow points to
+        p2 ((float, float)): position the arrow starts at
+        color ((int, int, int, int)): color of the arrow
+    """
+    item = dpg.draw_arrow(p1, p2, thickness=4, color=color, parent="mainwindow")
+    arrows[item] = color
+    # arrows outside the culled view are hidden right away
+    if not index.insert(item, p1, p2):
+        dpg.hide_item(item)
+
+def delete_arrows(items):
+    """Delete arrows from the window and the index.
+
+    Args:
+        items ([int]): item ids of the arrows
+    """
+    for item in list(items):
+        dpg.delete_item(item)
+        del arrows[item]
+        index.remove(item)
+        selection.discard(item)
+
+def set_selection(items, seconds=None):
+    """Select arrows, the previously selected arrows get their own color back.
+
+    Args:
+        items (set): item ids of the arrows to select
+        seconds (float, optional): duration of the hit test, shown in the tool window. Defaults to None.
+    """
+    for item in selection - items:
+        dpg.configure_item(item, color=arrows[item])
+    for item in items - selection:
+        dpg.configure_item(item, color=SELECTED_COLOR)
+    selection.clear()
+    selection.update(items)
+    info = f"{len(selection)} of {len(arrows)} arrows selected"
+    if seconds is not None:
+        info += f" (hit test {seconds * 1000:.2f} ms)"
+    dpg.set_value("tool_info", info)
+
+def erase_arrows(position):
+    """Delete the arrows within ERASER_RADIUS of a position.
+
+    Args:
+        position ((float, float)): center of the eraser
+    """
+    stime = time.perf_counter()
+    found = index.near(position, ERASER_RADIUS)
+    seconds = time.perf_counter() - stime
+    if found:
+        delete_arrows([item for _, item in found])
+        dpg.set_value("tool_info", f"erased {len(found)}, {len(arrows)} arrows left (hit test {seconds * 1000:.2f} ms)")
+
+def release_handler():
+    """handler for mouse release events
+    Selects the arrows touching the selection box when the box is finished.
+    """
+    global box_start
+    if box_start is None:
+        return
+    stime = time.perf_counter()
+    items = index.in_box(box_start, get_mouse_coords())
+    box_start = None
+    dpg.hide_item(box_rect)
+    set_selection(items, time.perf_counter() - stime)
+
+def select_tool(sender, app_data):
+    """Callback of the tool radio buttons, drops an unfinished arrow or box of the previous tool."""
+    global box_start
+    cancel_mark()
+    box_start = None
+    dpg.hide_item(box_rect)
+
+def update_tools():
+    """called once per rendered frame
+    Resizes the selection box while it is drawn and erases while the mouse button is held with the eraser.
+    """
+    if box_start is not None:
+        dpg.configure_item(box_rect, pmax=get_mouse_coords())
+    elif dpg.get_value("tool") == "erase" and dpg.is_mouse_button_down(dpg.mvMouseButton_Left) and not dpg.is_item_hovered("tools"):
+        erase_arrows(get_mouse_coords())
+
+def update_culling():
+    """called once per rendered frame
+    Hides the arrows outside the visible part of the window and shows the ones scrolled into it,
+    only when the window was scrolled or resized. The index tells which arrows changed, the others are not touched.
+    """
+    global view
+    x = dpg.get_x_scroll("mainwindow")
+    y = dpg.get_y_scroll("mainwindow")
+    width, height = dpg.get_item_rect_size("mainwindow")
+    if (x, y, width, height) == view or not width:
+        return
+    view = (x, y, width, height)
+    # one cell around the window, so thick lines and arrow heads just outside are drawn as well
+    margin = index.cell_size
+    shown, hidden = index.set_view((x - margin, y - margin), (x + width + margin, y + height + margin))
+    for item in shown:
+        dpg.show_item(item)
+    for item in hidden:
+        dpg.hide_item(item)
+
+def clear_arrows(sender, app_data):
+    """handler for the delete key
+    Removes the selected arrows, or all finished arrows if none is selected. The rest of the window is not touched.
+    """
+    delete_arrows(list(selection) if selection else list(arrows))
+    set_selection(set())
 
 def random_color():
     """helper function to generate a random color
@@ -77,12 +265,29 @@ with dpg.window(tag="mainwindow"):
     with dpg.drawlist(width=3000, height=3000):
         pass
 
+    # the preview arrow, moved by update_preview() and shown by click_handler()
+    preview_arrow = dpg.draw_arrow((0, 0), (0, 0), thickness=4, show=False)
+    # the selection box, resized by update_tools()
+    box_rect = dpg.draw_rectangle((0, 0), (0, 0), color=SELECTED_COLOR, fill=(255, 255, 255, 40), show=False)
+
+# small window to choose the tool
+with dpg.window(tag="tools", label="tools", pos=(20, 20), autosize=True, no_close=True):
+    dpg.add_radio_button(TOOLS, tag="tool", default_value="draw", callback=select_tool)
+    dpg.add_text("Delete removes the selected arrows, or all arrows if none are selected.")
+    dpg.add_text(tag="tool_info")
+
 # register the mouse click handler
 with dpg.handler_registry():
     dpg.add_mouse_click_handler(callback=click_handler)
+    # the selection box is finished when the mouse button is released
+    dpg.add_mouse_release_handler(callback=release_handler)
+    # register the delete key handler to remove the selected or all arrows
+    dpg.add_key_press_handler(dpg.mvKey_Delete, callback=clear_arrows)
 
 
 # final setup required by dpg
+# only render a frame when there is input (mouse, keyboard, window events), the loop below sleeps otherwise
+dpg.configure_app(wait_for_input=True)
 dpg.setup_dearpygui()
 dpg.show_viewport()
 # maximize the window
@@ -91,19 +296,14 @@ dpg.maximize_viewport()
 dpg.set_primary_window("mainwindow", True)
 
 # instead of running start_dearpygui(), we will execute the frame render manually
+# with wait_for_input, render_dearpygui_frame() waits for the next input, an idle window costs no CPU
 while dpg.is_dearpygui_running():
-    # setup markmouse variable to remember the arrow moving with the mouse
-    global markmouse
-    markmouse = None
-    # if there was a click and the marking circle is currently on screen, we will draw a moving arrow pointing to the mouse
-    if mouse_mark:
-        # note: the color is random and will be reevaluated every frame
-        markmouse = dpg.draw_arrow(get_mouse_coords(), mouse_mark_pos, thickness=4, color=random_color(), parent="mainwindow")
+    # if there was a click and the marking circle is currently on screen, the preview arrow follows the mouse
+    update_preview()
+    update_tools()
+    # only the arrows in the visible part of the window are drawn
+    update_culling()
     # render the frame
     dpg.render_dearpygui_frame()
-    # after the frame was rendered, check again to see if a second click was made
-    if mouse_mark and markmouse != None:
-        # delete the moving arrow
-        dpg.delete_item(markmouse)
-    
+
 dpg.destroy_context()
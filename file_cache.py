@@ -0,0 +1,82 @@
+# file metadata cache for the file dialog example
+# every file is stat'ed once, later lookups of the same path are answered from memory,
+# so clicking through a listing on slow storage does not cost a syscall per click
+
+from collections import OrderedDict
+import os
+
+class MetadataCache:
+    """LRU cache of os.stat_result by path.
+    An entry is replaced as soon as newer metadata with a different modification time is seen
+    for its path, e.g. from the entry of a rescan or a change event, and can be dropped with invalidate().
+    """
+
+    def __init__(self, size=4096):
+        """
+        Args:
+            size (int, optional): number of paths to keep. Defaults to 4096.
+        """
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        # path -> (os.stat_result, os.DirEntry the result came from or None)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path, entry=None):
+        """Get the metadata of a path, with at most one stat call if it is not cached.
+
+        Args:
+            path (str): path of the file
+            entry (os.DirEntry, optional): entry of the path from os.scandir, its stat result is
+                                           reused and cached by the entry itself. Defaults to None.
+
+        Returns:
+            os.stat_result: metadata of the file
+
+        Raises:
+            OSError: if the file cannot be stat'ed
+        """
+        cached = self._entries.get(path)
+        # a new scan entry is a newer snapshot, its (own cached) stat decides if the file changed
+        if cached is not None and (entry is None or entry is cached[1]):
+            self.hits += 1
+            self._entries.move_to_end(path)
+            return cached[0]
+        self.misses += 1
+        stat = entry.stat() if entry is not None else os.stat(path)
+        self.put(path, stat, entry)
+        return self._entries[path][0]
+
+    def put(self, path, stat, entry=None):
+        """Offer newer metadata for a path. Replaces the cached metadata if the modification time differs.
+
+        Args:
+            path (str): path of the file
+            stat (os.stat_result): metadata of the file
+            entry (os.DirEntry, optional): scan entry the metadata came from. Defaults to None.
+        """
+        cached = self._entries.get(path)
+        if cached is None or cached[0].st_mtime_ns != stat.st_mtime_ns:
+            self._store(path, (stat, entry))
+        else:
+            self._store(path, (cached[0], entry))
+
+    def invalidate(self, path):
+        """Forget a path, the next get() stats it again.
+
+        Args:
+            path (str): path of the file
+        """
+        self._entries.pop(path, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _store(self, path, value):
+        self._entries[path] = value
+        self._entries.move_to_end(path)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
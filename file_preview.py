@@ -0,0 +1,130 @@
+# file preview and hashing for the file dialog example
+# the preview memory-maps the file and only reads the bytes currently shown, so scrolling through
+# a file of any size is instant and costs no memory; hashing streams the file on a worker thread
+# through one reused buffer and never loads the whole file
+
+import hashlib
+import mmap
+import threading
+
+# bytes per line of the hex view
+HEX_WIDTH = 16
+
+class FilePreview:
+    """Read-only memory map of a file, windows of it are read with read()."""
+
+    def __init__(self, filename):
+        """
+        Args:
+            filename (str): path of the file
+
+        Raises:
+            OSError: if the file cannot be opened or mapped
+        """
+        self.filename = filename
+        self._file = open(filename, "rb")
+        try:
+            self._file.seek(0, 2)
+            self.size = self._file.tell()
+            # empty files cannot be mapped
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        except (OSError, ValueError) as error:
+            self._file.close()
+            raise OSError(f"cannot map {filename}: {error}") from error
+
+    def read(self, offset, length):
+        """Read a window of the file, only its pages are loaded from disk.
+
+        Args:
+            offset (int): first byte
+            length (int): number of bytes, fewer at the end of the file
+
+        Returns:
+            bytes: content of the window
+        """
+        if self._map is None:
+            return b""
+        return self._map[offset:offset + length]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+def format_hex(data, offset):
+    """Format bytes as hex dump lines of HEX_WIDTH bytes with offset and printable characters.
+
+    Args:
+        data (bytes): bytes to show
+        offset (int): file offset of the first byte
+
+    Returns:
+        str: one line per HEX_WIDTH bytes
+    """
+    lines = []
+    for start in range(0, len(data), HEX_WIDTH):
+        chunk = data[start:start + HEX_WIDTH]
+        text = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+        lines.append(f"{offset + start:012x}  {chunk.hex(' '):<{HEX_WIDTH * 3}} {text}")
+    return "\n".join(lines)
+
+def format_text(data):
+    """Decode bytes as UTF-8 text, invalid bytes (also characters cut at the window edges) become replacement characters."""
+    return data.decode("utf-8", errors="replace")
+
+class FileHasher(threading.Thread):
+    """Computes a checksum of a file on a background thread, reading it in chunks."""
+
+    def __init__(self, filename, algorithm="sha256", chunk_size=1 << 20):
+        """
+        Args:
+            filename (str): path of the file
+            algorithm (str, optional): name of a hashlib algorithm. Defaults to "sha256".
+            chunk_size (int, optional): bytes read at once. Defaults to 1 MiB.
+        """
+        super().__init__(daemon=True)
+        self.filename = filename
+        self.algorithm = algorithm
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.hashed = 0
+        self.hexdigest = None
+        self.error = None
+        self.finished = False
+        self._cancelled = False
+
+    @property
+    def progress(self):
+        """Fraction of the file hashed so far, between 0 and 1."""
+        return self.hashed / self.size if self.size else float(self.finished)
+
+    @property
+    def done(self):
+        return self.finished
+
+    def cancel(self):
+        """Stop hashing after the current chunk."""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            digest = hashlib.new(self.algorithm)
+            buffer = bytearray(self.chunk_size)
+            view = memoryview(buffer)
+            with open(self.filename, "rb", buffering=0) as hash_file:
+                hash_file.seek(0, 2)
+                self.size = hash_file.tell()
+                hash_file.seek(0)
+                while not self._cancelled:
+                    # hashlib releases the GIL for big chunks, the UI keeps running
+                    count = hash_file.readinto(buffer)
+                    if not count:
+                        break
+                    digest.update(view[:count])
+                    self.hashed += count
+            if not self._cancelled:
+                self.hexdigest = digest.hexdigest()
+        except (OSError, ValueError) as error:
+            self.error = error
+        finally:
+            self.finished = True
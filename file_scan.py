@@ -0,0 +1,72 @@
+# background directory scanning for the file dialog example
+# os.scandir runs on a worker thread and hands entries over in batches, so a directory with
+# hundreds of thousands of entries on a slow or network mounted drive never blocks the UI
+
+import os
+import queue
+import threading
+
+class DirectoryScanner(threading.Thread):
+    """Lists one directory with os.scandir on a background thread.
+    The entries (os.DirEntry) are handed over in batches through a queue, the UI takes them
+    with next_batch() while it keeps rendering.
+    """
+
+    def __init__(self, directory, batch_size=1000):
+        """
+        Args:
+            directory (str): directory to list
+            batch_size (int, optional): entries per batch. Defaults to 1000.
+        """
+        super().__init__(daemon=True)
+        self.directory = directory
+        self.batch_size = batch_size
+        # number of entries scanned so far, also counts batches the UI did not take yet
+        self.count = 0
+        self.error = None
+        self.finished = False
+        self._batches = queue.Queue()
+        self._cancelled = False
+
+    def cancel(self):
+        """Stop scanning, the thread ends after the current entry."""
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def next_batch(self):
+        """Get the next batch of entries without waiting.
+
+        Returns:
+            [os.DirEntry]: entries of the batch, or None if no batch is ready
+        """
+        try:
+            return self._batches.get_nowait()
+        except queue.Empty:
+            return None
+
+    @property
+    def done(self):
+        """True once the directory was listed completely and every batch was taken."""
+        return self.finished and self._batches.empty()
+
+    def run(self):
+        batch = []
+        try:
+            with os.scandir(self.directory) as iterator:
+                for entry in iterator:
+                    if self._cancelled:
+                        return
+                    batch.append(entry)
+                    self.count += 1
+                    if len(batch) == self.batch_size:
+                        self._batches.put(batch)
+                        batch = []
+        except OSError as error:
+            self.error = error
+        finally:
+            if batch and not self._cancelled:
+                self._batches.put(batch)
+            self.finished = True
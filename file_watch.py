@@ -0,0 +1,202 @@
+# directory watching for the file dialog example
+# on Linux the kernel reports changes through inotify (used via ctypes, no extra package needed),
+# everywhere else the directory is listed again periodically on a background thread and compared
+# both watchers report the same events, so the listing can be updated without a full rescan
+
+import ctypes
+import ctypes.util
+import os
+import queue
+import struct
+import sys
+import threading
+
+# event kinds, every event is a tuple (kind, name)
+CREATED = "created"
+DELETED = "deleted"
+MODIFIED = "modified"
+# events were lost, the directory has to be listed again (name is None)
+OVERFLOW = "overflow"
+# the watched directory itself was deleted, moved away or cannot be listed (name is None)
+GONE = "gone"
+
+# inotify flags from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+# header of every inotify event: watch descriptor, mask, cookie, length of the name
+_EVENT = struct.Struct("iIII")
+
+class InotifyWatcher:
+    """Watches a directory with Linux inotify. The file descriptor is non-blocking, poll() only
+    reads the events that are already queued and never waits.
+    """
+
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): directory to watch
+
+        Raises:
+            OSError: if inotify is not available or the directory cannot be watched
+        """
+        self.directory = directory
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, os.strerror(error), directory)
+
+    @property
+    def ready(self):
+        """Always True, changes are reported from the moment the watch is added."""
+        return True
+
+    def poll(self):
+        """Read the queued events.
+
+        Returns:
+            [(str, str)]: events (kind, name) in the order they happened
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    events.append((OVERFLOW, None))
+                elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    events.append((GONE, None))
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    events.append((CREATED, name))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    events.append((DELETED, name))
+                elif name:
+                    events.append((MODIFIED, name))
+
+    def close(self):
+        os.close(self._fd)
+
+class PollingWatcher(threading.Thread):
+    """Watches a directory by listing it every interval seconds on a background thread and comparing
+    the modification time and size of every entry with the previous listing.
+    The first listing is taken on the thread as well, so creating the watcher never blocks. Changes
+    are only reported once it is done, see ready. For big directories a listing takes as long as a
+    scan, which is why inotify is preferred.
+    """
+
+    def __init__(self, directory, interval=1.0):
+        """
+        Args:
+            directory (str): directory to watch
+            interval (float, optional): seconds between two listings. Defaults to 1.0.
+        """
+        super().__init__(daemon=True)
+        self.directory = directory
+        self.interval = interval
+        self._events = queue.Queue()
+        self._closed = threading.Event()
+        # listing the changes are found against, None until the first listing is done
+        self._snapshot = None
+        self._ready = threading.Event()
+        self.start()
+
+    @property
+    def ready(self):
+        """True once the first listing is done (or failed), changes made before are not reported.
+        A scan that must not miss changes starts after this.
+        """
+        return self._ready.is_set()
+
+    def _list(self):
+        """Modification time and size of every entry by name."""
+        snapshot = {}
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    pass
+        return snapshot
+
+    def run(self):
+        # the first listing is taken right away, the next ones every interval
+        wait = 0
+        while not self._closed.wait(wait):
+            wait = self.interval
+            try:
+                snapshot = self._list()
+            except OSError:
+                self._events.put((GONE, None))
+                self._ready.set()
+                return
+            previous = self._snapshot
+            if previous is None:
+                self._snapshot = snapshot
+                self._ready.set()
+                continue
+            for name in previous.keys() - snapshot.keys():
+                self._events.put((DELETED, name))
+            for name, state in snapshot.items():
+                if name not in previous:
+                    self._events.put((CREATED, name))
+                elif previous[name] != state:
+                    self._events.put((MODIFIED, name))
+            self._snapshot = snapshot
+
+    def poll(self):
+        """Take the events found so far.
+
+        Returns:
+            [(str, str)]: events (kind, name)
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        self._closed.set()
+
+def watch(directory, interval=1.0):
+    """Watch a directory with inotify if possible, by polling otherwise.
+
+    Args:
+        directory (str): directory to watch
+        interval (float, optional): seconds between two listings when polling. Defaults to 1.0.
+
+    Returns:
+        InotifyWatcher or PollingWatcher: watcher with poll() and close()
+    """
+    try:
+        return InotifyWatcher(directory)
+    except (OSError, AttributeError):
+        return PollingWatcher(directory, interval)
@@ -1,10 +1,63 @@
 # Dear PyGui file dialog example
 # choose a directory, populate a listbox with items
+# the directory is scanned on a background thread and the listbox fills while scanning
+# optionally the directory is watched and changes are applied to the listing as they happen
 # when selected, display some file info
 
 import dearpygui.dearpygui as dpg
-from os import listdir, path
+from os import path
+import math
+import stat as stat_module
+import threading
 import time
+import disk_usage
+import file_cache
+import file_preview
+import file_scan
+import file_watch
+import name_index
+
+# seconds between two updates of the listbox while a scan is running
+LISTBOX_REFRESH = 0.25
+# seconds without created or deleted entries before the name index of a watched directory is built again
+INDEX_REBUILD_DELAY = 2.0
+# lines of the hex preview and bytes of the text preview shown at once
+PREVIEW_LINES = 24
+PREVIEW_TEXT_BYTES = 2048
+
+# running or last scan (file_scan.DirectoryScanner), None before the first directory is chosen
+scanner = None
+# directory whose scan waits for the first listing of a polling watcher, None if there is none
+scan_directory = None
+# entries (os.DirEntry) of the current directory by name and the names as shown in "files_listbox",
+# entries reported by the watcher have no os.DirEntry and are None
+entries = {}
+names = []
+# time of the last listbox update
+last_refresh = 0
+# watcher of the current directory (file_watch.InotifyWatcher or PollingWatcher), None if not watching
+watcher = None
+# number of changes applied, time of the last created or deleted entry and if the listbox is behind
+changes = 0
+last_change = 0
+listing_dirty = False
+# name index of the finished scan for the filter box, None while scanning
+names_index = None
+# metadata of the files looked at so far, one stat per file
+metadata = file_cache.MetadataCache()
+
+# preview of the selected file (file_preview.FilePreview) and the running checksum (file_preview.FileHasher)
+preview = None
+hasher = None
+
+# running disk usage indexer (disk_usage.DiskUsageIndexer), None if there is none
+indexer = None
+# connection to the index database of the UI thread and the database file it belongs to
+du_connection = None
+du_database = None
+# directory shown in "du_listbox" and the directory of every line of the listbox
+du_path = None
+du_lines = {}
 
 # create context
 dpg.create_context()
@@ -27,22 +80,189 @@ def select_directory(sender, app_data):
         dpg.add_file_extension(".*")
 
 def process_directory(sender, app_data):
-    """Function to get all files and directories within the selected directory.
-    Will populate the listbox "files_listbox" with the items.
+    """Function to start listing all files and directories within the selected directory.
+    The scan runs on a background thread, update_scan() populates the listbox "files_listbox"
+    with the items while it runs. A scan that is still running gets cancelled.
 
     Args:
         sender (obj): Dear PyGui sender widget
         app_data ([obj]): information from the file dialog: file_path_name, file_name, current_path, current_filter, selections[]
     """
+    global scanner
+    global scan_directory
+    global names_index
     # retrieve file path
     directory = app_data["file_path_name"]
-    # get all files and directories from path
-    files = listdir(directory)
-    # add files to the listbox
-    dpg.configure_item("files_listbox", items=files)
+    # stop listing the previous directory
+    if scanner is not None:
+        scanner.cancel()
+        scanner = None
+    # start listing all files and directories from path
+    entries.clear()
+    names.clear()
+    names_index = None
+    dpg.configure_item("files_listbox", items=names)
+    # the watcher starts before the scan, so no change between scan and watch is missed
+    # a polling watcher lists the directory on its thread first, update_scan() starts the scan after it
+    stop_watch()
+    if dpg.get_value("watch_directory"):
+        start_watch(directory)
+    scan_directory = directory
+    dpg.set_value("scan_text", "waiting for the watcher to list the directory")
+    update_scan()
     # update the UI to confirm selected directory
     dpg.set_value("file_text", directory)
 
+def update_scan():
+    """Called once per rendered frame. Takes the entries scanned since the last frame, shows the
+    number of scanned entries and updates the listbox every LISTBOX_REFRESH seconds and when the
+    scan is done, sending the whole list every frame would cost more than the scan itself.
+    Starts the scan of scan_directory once the watcher is ready.
+    """
+    global last_refresh
+    global names_index
+    global scanner
+    global scan_directory
+    if scan_directory is not None and (watcher is None or watcher.ready):
+        scanner = file_scan.DirectoryScanner(scan_directory)
+        scanner.start()
+        scan_directory = None
+    if scanner is None or scanner.cancelled:
+        return
+    added = False
+    batch = scanner.next_batch()
+    while batch is not None:
+        for entry in batch:
+            entries[entry.name] = entry
+            names.append(entry.name)
+        added = True
+        batch = scanner.next_batch()
+    done = scanner.done
+    if added and (done or time.perf_counter() - last_refresh > LISTBOX_REFRESH):
+        show_listing()
+        last_refresh = time.perf_counter()
+    # index the names once the directory is complete, the filter works without the index meanwhile
+    # a watched directory that keeps changing is indexed once the changes pause
+    if done and names_index is None and time.perf_counter() - last_change > INDEX_REBUILD_DELAY:
+        names_index = name_index.NameIndex(list(names))
+        threading.Thread(target=names_index.build, daemon=True).start()
+    if scanner.error is not None:
+        dpg.set_value("scan_text", f"{scanner.count} entries scanned, error: {scanner.error}")
+    elif done:
+        dpg.set_value("scan_text", f"{scanner.count} entries scanned, done")
+    else:
+        dpg.set_value("scan_text", f"{scanner.count} entries scanned")
+
+def show_listing():
+    """Show the entries matching the filter box "name_filter" in "files_listbox", all if it is empty.
+    Uses the name index of the directory once it is built, every keystroke only checks the names that
+    contain the pieces of the query.
+    """
+    query = dpg.get_value("name_filter")
+    if not query:
+        dpg.configure_item("files_listbox", items=names)
+        dpg.set_value("filter_info", "")
+        return
+    stime = time.perf_counter()
+    # while scanning, the entries so far are filtered without index
+    index = names_index if names_index is not None else name_index.NameIndex(list(names))
+    matches = [index.names[i] for i in index.search(query, dpg.get_value("filter_mode"))]
+    dpg.configure_item("files_listbox", items=matches)
+    dpg.set_value("filter_info", f"{len(matches)} of {len(index.names)} entries match "
+                                 f"({(time.perf_counter() - stime) * 1000:.1f} ms)")
+
+def filter_listing(sender, app_data):
+    """Callback of the filter box and the filter mode, filters the listing on every keystroke."""
+    show_listing()
+
+def start_watch(directory):
+    """Watch directory for changes, with inotify on Linux and by polling otherwise.
+
+    Args:
+        directory (str): directory to watch
+    """
+    global watcher
+    global changes
+    stop_watch()
+    changes = 0
+    # a directory that cannot be listed is reported by update_watch()
+    watcher = file_watch.watch(directory)
+    method = "inotify" if isinstance(watcher, file_watch.InotifyWatcher) else f"polling every {watcher.interval:g} s"
+    dpg.set_value("watch_text", f"watching with {method}")
+
+def stop_watch():
+    """Stop watching the current directory, the listing stays as it is."""
+    global watcher
+    if watcher is not None:
+        watcher.close()
+        watcher = None
+    dpg.set_value("watch_text", "")
+
+def toggle_watch(sender, app_data):
+    """Callback of the "watch_directory" checkbox, watches the chosen directory or stops watching."""
+    directory = dpg.get_value("file_text")
+    if not app_data:
+        stop_watch()
+    elif directory:
+        start_watch(directory)
+
+def update_watch():
+    """Called once per rendered frame. Applies the changes reported by the watcher to the listing,
+    the name index and the metadata cache, instead of listing the directory again.
+    Changes wait in the watcher until the scan is done, entries the scan already found are not added twice.
+    """
+    global names_index
+    global changes
+    global last_change
+    global last_refresh
+    global listing_dirty
+    if watcher is None or scanner is None or not scanner.done:
+        return
+    directory = watcher.directory
+    # names to remove from the listing, collected to filter the list once instead of once per name
+    deleted = set()
+    listing_changed = False
+    for kind, name in watcher.poll():
+        if kind == file_watch.OVERFLOW:
+            # events were lost, only a new scan knows the directory again
+            process_directory(None, {"file_path_name": directory})
+            return
+        if kind == file_watch.GONE:
+            stop_watch()
+            dpg.set_value("watch_text", f"{directory} is gone or unreadable, not watching anymore")
+            return
+        changes += 1
+        metadata.invalidate(path.join(directory, name))
+        if kind == file_watch.DELETED:
+            if entries.pop(name, False) is not False:
+                deleted.add(name)
+        elif name in deleted:
+            # deleted and created again (e.g. replaced by a rename), it is still in the listing
+            deleted.discard(name)
+            entries[name] = None
+        elif name in entries:
+            # the scan entry caches the old stat, the next selection stats the file again
+            entries[name] = None
+        elif kind == file_watch.CREATED:
+            entries[name] = None
+            names.append(name)
+            listing_changed = True
+    if deleted:
+        names[:] = [name for name in names if name not in deleted]
+        listing_changed = True
+    # the index does not know the new names, the filter works without it until it is built again
+    if listing_changed:
+        names_index = None
+        last_change = time.perf_counter()
+        listing_dirty = True
+    # like while scanning, the listbox is updated at most every LISTBOX_REFRESH seconds
+    if listing_dirty and time.perf_counter() - last_refresh > LISTBOX_REFRESH:
+        show_listing()
+        last_refresh = time.perf_counter()
+        listing_dirty = False
+    if watcher is not None and changes:
+        dpg.set_value("watch_text", f"watching {directory}, {changes} changes applied, {len(names)} entries")
+
 def select_file(sender, app_data):
     """Function to update the GUI when a file in the listbox is selected.
     Retrieves some information on the selected files and displays them in the GUI.
@@ -51,20 +271,193 @@ def select_file(sender, app_data):
         sender (obj): Dear PyGui sender widget
         app_data (str): selected listbox entry
     """
+    global preview
+    global hasher
+    # the previous file is not previewed or hashed anymore
+    if preview is not None:
+        preview.close()
+        preview = None
+    if hasher is not None:
+        hasher.cancel()
+        hasher = None
+        dpg.set_value("hash_progress", 0)
+        dpg.set_value("hash_text", "")
     # get selected file
     selected_file = app_data
     # get current path
     cwd = dpg.get_value("file_text")
+    # the scan entry, its stat result is reused
+    entry = entries.get(selected_file)
     # add path to file/dir
-    selected_file = cwd + "/" + selected_file
+    selected_file = path.join(cwd, selected_file)
 
-    # get some basic file info and display it via gui
+    # get some basic file info with a single (cached) stat and display it via gui
     dpg.set_value("file_info_n", "file          :" + selected_file)
-    dpg.set_value("file_info_1", "last accessed :" + time.ctime(path.getatime(selected_file)))
-    dpg.set_value("file_info_2", "last modified :" + time.ctime(path.getmtime(selected_file)))
-    dpg.set_value("file_info_3", "last changed  :" + time.ctime(path.getctime(selected_file)))
-    dpg.set_value("file_info_4", "file size     :" + path.getsize(selected_file))
+    try:
+        stat = metadata.get(selected_file, entry)
+    except OSError as error:
+        dpg.set_value("file_info_1", f"error         :{error}")
+        for tag in ["file_info_2", "file_info_3", "file_info_4"]:
+            dpg.set_value(tag, "")
+        show_preview()
+        return
+    dpg.set_value("file_info_1", "last accessed :" + time.ctime(stat.st_atime))
+    dpg.set_value("file_info_2", "last modified :" + time.ctime(stat.st_mtime))
+    dpg.set_value("file_info_3", "last changed  :" + time.ctime(stat.st_ctime))
+    dpg.set_value("file_info_4", f"file size     :{stat.st_size}")
+
+    # preview regular files from the start
+    if stat_module.S_ISREG(stat.st_mode):
+        try:
+            preview = file_preview.FilePreview(selected_file)
+        except OSError as error:
+            dpg.set_value("preview_text", f"no preview: {error}")
+            return
+    lines = math.ceil(preview.size / file_preview.HEX_WIDTH) if preview is not None else 0
+    dpg.configure_item("preview_position", max_value=max(lines - PREVIEW_LINES, 0))
+    dpg.set_value("preview_position", 0)
+    show_preview()
+
+def show_preview():
+    """Show the part of the previewed file at "preview_position" (in lines of the hex view)
+    in "preview_text", as hex dump or text depending on "preview_mode". Only that part is read.
+    """
+    if preview is None:
+        dpg.set_value("preview_text", "")
+        return
+    offset = int(dpg.get_value("preview_position")) * file_preview.HEX_WIDTH
+    if dpg.get_value("preview_mode") == "hex":
+        dpg.set_value("preview_text", file_preview.format_hex(preview.read(offset, PREVIEW_LINES * file_preview.HEX_WIDTH), offset))
+    else:
+        dpg.set_value("preview_text", file_preview.format_text(preview.read(offset, PREVIEW_TEXT_BYTES)))
+
+def scroll_preview(sender, app_data):
+    """Callback of the preview slider and mode."""
+    show_preview()
 
+def scroll_wheel(sender, app_data):
+    """Mouse wheel handler, scrolls the preview by three lines per step while the mouse is over it."""
+    if preview is not None and dpg.is_item_hovered("preview_text"):
+        position = dpg.get_value("preview_position") - 3 * int(app_data)
+        dpg.set_value("preview_position", min(max(position, 0), dpg.get_item_configuration("preview_position")["max_value"]))
+        show_preview()
+
+def start_hash(sender, app_data):
+    """Click-handler for the checksum button, hashes the previewed file on a background thread."""
+    global hasher
+    if preview is None:
+        dpg.set_value("hash_text", "select a file first")
+        return
+    if hasher is not None:
+        hasher.cancel()
+    hasher = file_preview.FileHasher(preview.filename)
+    hasher.start()
+
+def update_hash():
+    """Called once per rendered frame. Shows the progress and the result of the running checksum."""
+    global hasher
+    if hasher is None:
+        return
+    dpg.set_value("hash_progress", hasher.progress)
+    if hasher.error is not None:
+        dpg.set_value("hash_text", f"SHA-256 failed: {hasher.error}")
+        hasher = None
+    elif hasher.done:
+        dpg.set_value("hash_text", f"SHA-256: {hasher.hexdigest}")
+        hasher = None
+    else:
+        dpg.set_value("hash_text", f"SHA-256: {hasher.hashed >> 20} of {hasher.size >> 20} MiB")
+
+def open_index():
+    """Connect to the index database in "index_file", reusing the connection if the file did not change.
+
+    Returns:
+        sqlite3.Connection: connection of the UI thread
+    """
+    global du_connection
+    global du_database
+    database = dpg.get_value("index_file")
+    if du_connection is None or database != du_database:
+        if du_connection is not None:
+            du_connection.close()
+        du_connection = disk_usage.connect(database)
+        du_database = database
+    return du_connection
+
+def show_disk_usage(directory):
+    """Show the indexed subdirectories of directory in "du_listbox", biggest first.
+    Reads only the database, nothing on disk.
+
+    Args:
+        directory (str): directory to show
+    """
+    global du_path
+    connection = open_index()
+    totals = disk_usage.directory(connection, directory)
+    du_lines.clear()
+    if totals is None:
+        dpg.set_value("du_total", f"{directory} is not indexed yet")
+        dpg.configure_item("du_listbox", items=[])
+        return
+    du_path = directory
+    own_size, own_files, total_size, total_files = totals
+    dpg.set_value("du_total", f"{directory}: {disk_usage.format_size(total_size)} in {total_files} files")
+    # go up, if the parent is indexed as well
+    parent = path.dirname(directory)
+    if parent != directory and disk_usage.directory(connection, parent) is not None:
+        du_lines[".."] = parent
+    for subdir, size, files in disk_usage.children(connection, directory):
+        du_lines[f"{disk_usage.format_size(size):>10} {files:>10} files  {path.basename(subdir)}"] = subdir
+    du_lines[f"{disk_usage.format_size(own_size):>10} {own_files:>10} files  (directly in this directory)"] = directory
+    dpg.configure_item("du_listbox", items=list(du_lines))
+
+def select_disk_usage(sender, app_data):
+    """Callback of "du_listbox", shows the selected subdirectory (or ".." the parent)."""
+    directory = du_lines.get(app_data)
+    if directory is not None and directory != du_path:
+        show_disk_usage(directory)
+
+def start_indexing(sender, app_data):
+    """Click-handler for the index button. Shows the previous index of the chosen directory right
+    away, if there is one, and indexes the tree again on a background thread, which only lists the
+    directories that changed since.
+    """
+    global indexer
+    directory = dpg.get_value("file_text")
+    if not directory:
+        dpg.set_value("du_text", "choose a directory first")
+        return
+    if indexer is not None:
+        indexer.cancel()
+    show_disk_usage(directory)
+    indexer = disk_usage.DiskUsageIndexer(directory, dpg.get_value("index_file"))
+    indexer.start()
+
+def update_disk_usage():
+    """Called once per rendered frame. Shows the progress of the running indexer and the new
+    index once it is done.
+    """
+    global indexer
+    if indexer is None:
+        return
+    progress = f"{indexer.scanned} directories listed, {indexer.reused} unchanged, {indexer.errors} unreadable"
+    if indexer.error is not None:
+        dpg.set_value("du_text", f"{progress}, error: {indexer.error}")
+        indexer = None
+    elif indexer.done:
+        dpg.set_value("du_text", f"{progress}, done")
+        root = indexer.root
+        # stay in the shown directory if it is the indexed one or below it, "/data2" is not below "/data"
+        inside = du_path is not None and (du_path == root or du_path.startswith(root.rstrip(path.sep) + path.sep))
+        show_disk_usage(du_path if inside else root)
+        indexer = None
+    else:
+        dpg.set_value("du_text", progress)
+
+
+# scroll the preview with the mouse wheel
+with dpg.handler_registry():
+    dpg.add_mouse_wheel_handler(callback=scroll_wheel)
 
 # create mainwindow
 with dpg.window(tag="mainwindow"):
@@ -76,6 +469,17 @@ with dpg.window(tag="mainwindow"):
     # file input information
     dpg.add_text(tag="file_text")
     dpg.add_button(label="choose directory", callback=select_directory)
+    # live counter of the running scan
+    dpg.add_text(tag="scan_text")
+    # keep the listing current while files are created, deleted, renamed or modified
+    dpg.add_checkbox(tag="watch_directory", label="watch directory for changes", callback=toggle_watch)
+    dpg.add_text(tag="watch_text")
+
+    # filter box for the listing, narrows the listbox while typing
+    with dpg.group(horizontal=True):
+        dpg.add_input_text(tag="name_filter", label="filter", width=400, callback=filter_listing)
+        dpg.add_combo(name_index.MODES, tag="filter_mode", default_value="substring", width=150, callback=filter_listing)
+    dpg.add_text(tag="filter_info")
 
     # list box for files in directory
     dpg.add_listbox(tag="files_listbox", label="files in directory", callback=select_file, num_items=12)
@@ -87,6 +491,25 @@ with dpg.window(tag="mainwindow"):
     dpg.add_text(tag="file_info_3")
     dpg.add_text(tag="file_info_4")
 
+    # preview of the selected file, only the shown part is read
+    with dpg.collapsing_header(label="Preview"):
+        with dpg.group(horizontal=True):
+            dpg.add_radio_button(["hex", "text"], tag="preview_mode", default_value="hex", horizontal=True, callback=scroll_preview)
+            dpg.add_slider_double(tag="preview_position", label="line", width=600, format="%.0f", callback=scroll_preview)
+        dpg.add_text(tag="preview_text")
+        with dpg.group(horizontal=True):
+            dpg.add_button(label="compute SHA-256", callback=start_hash)
+            dpg.add_progress_bar(tag="hash_progress", width=300)
+        dpg.add_text(tag="hash_text")
+
+    # recursive disk usage of the chosen directory, kept in an index database
+    with dpg.collapsing_header(label="Disk usage"):
+        dpg.add_input_text(tag="index_file", label="index database", default_value="disk_usage.sqlite")
+        dpg.add_button(label="index chosen directory", callback=start_indexing)
+        dpg.add_text(tag="du_text")
+        dpg.add_text(tag="du_total")
+        dpg.add_listbox(tag="du_listbox", label="subdirectories", callback=select_disk_usage, num_items=12)
+
 # finish the setup, show viewport, set primary window - maybe maximize
 dpg.setup_dearpygui()
 dpg.show_viewport()
@@ -94,5 +517,12 @@ dpg.show_viewport()
 #dpg.maximize_viewport()
 # set primary window to mainwindow
 dpg.set_primary_window("mainwindow", True)
-dpg.start_dearpygui()
+
+# instead of running start_dearpygui(), the frames are rendered manually to take scanned entries in between
+while dpg.is_dearpygui_running():
+    update_scan()
+    update_watch()
+    update_disk_usage()
+    update_hash()
+    dpg.render_dearpygui_frame()
 dpg.destroy_context()
@@ -1,240 +1,466 @@
 # Dear PyGui basic plotting example to visualize sorting algorithms
 
-from functools import partial
+from collections import deque
 import dearpygui.dearpygui as dpg
-from enum import Enum
-import random
+import json
+import numpy as np
 import time
+import decimation
+import sort_trace
+import sorting
+import tag_scope
+
+# plot data as contiguous float64 arrays, x is the index of each value
+xvalues = np.zeros(0)
+yvalues = np.zeros(0)
+sorted_values = np.zeros(0)
+
+# level of detail: series are decimated to the plot width and cached per data version and zoom level
+lod_cache = decimation.DecimationCache()
+# incremented whenever the data behind "scatter_plot" or "line_plot" changes
+scatter_version = 0
+line_version = 0
+# x axis limits the series were last decimated for, None shows the whole data
+plot_limits = None
+
+# background worker of the current sort run, polled by update_plot() in the render loop
+worker = None
+# replay position of the snapshot currently shown in the plot
+shown_position = -1
+# time the full scatter series was last refreshed, in between only the overlays are updated
+base_refresh_time = 0
+
+class RunMetrics:
+    """Timings of the UI side of one sort run. The algorithm side is measured by the sorting.SortWorker."""
+
+    def __init__(self, algorithm=None, worker=None):
+        """
+        Args:
+            algorithm (str, optional): name of the algorithm. Defaults to None.
+            worker (sorting.SortWorker, optional): worker of the run. Defaults to None.
+        """
+        self.algorithm = algorithm
+        self.worker = worker
+        self.set_value_time = 0
+        self.ui_pushes = 0
+        # only the newest frames are kept for the histogram, frames counts all of them
+        self.frame_times = deque(maxlen=5000)
+        self.frames = 0
+
+# metrics of the current or last sort run, shown in the metrics panel by update_metrics()
+metrics = RunMetrics()
+
+# trace file opened for seeking with the timeline slider
+trace = None
+# running or last recording (sort_trace.TraceWriter), polled by update_recording() in the render loop
+recorder = None
+
+# current race of several algorithms in separate processes, polled by update_race() in the render loop
+race = None
+# items of the race plots, deleted together when the next race starts
+race_scope = tag_scope.TagScope("race")
+# (plot, series) tags of every racer, as returned by race_scope
+race_items = []
 
-# set up sorting enum
-class SortingAlgorithm (str, Enum):
-    BUBBLE = "Bubble Sort",
-    INSERTION = "Insertion Sort",
-    QUICK = "Quick Sort",           # note: recursion and generators make this visualization interesting but not accurate
-    STALIN = "Stalin Sort"          # note: this is obviously a joke algorithm
+def sort(sender, app_data):
+    """Callback for the Sort-Button.
+    Gets current values from the plot and determines the algorithm for the sorting.
+    The algorithm runs on a background sorting.SortWorker at full speed and records an operation log,
+    which the worker then replays into snapshots that update_plot() shows from the render loop.
 
-# create context
-dpg.create_context()
+    Args:
+        sender (obj): Dear PyGui sender object for the callback
+        app_data (obj): App Data
+    """
+    global worker
+    global shown_position
+    global metrics
+    # nothing to sort before the first plot, update_plot() would draw into a plot that does not exist
+    if len(yvalues) == 0 or not dpg.does_item_exist("plot"):
+        return
+    # get sorting algorithm from the registry, every registered algorithm is offered in "combo_sorting"
+    algorithm = dpg.get_value("combo_sorting")
+    sort_function = sorting.ALGORITHMS[algorithm].function
+
+    # stop a previous run, only one worker at a time
+    stop_worker()
+    # sort and replay in the background, update_plot() picks up the snapshots
+    worker = sorting.SortWorker(yvalues, sort_function, dpg.get_value("input_steps"), dpg.get_value("input_fps"))
+    worker.start()
+    shown_position = -1
+    metrics = RunMetrics(algorithm, worker)
+    dpg.set_value("text_time", "Sorting ...")
+
+def stop_worker():
+    """Cancel the current sort worker if there is one and wait for it to finish.
+    The last snapshot of the worker becomes the current plot data.
+    """
+    global worker
+    if worker is not None:
+        worker.cancel()
+        worker.join()
+        finish_worker()
+
+def finish_worker():
+    """Take over the newest snapshot of the finished worker as plot data and forget the worker."""
+    global worker
+    global shown_position
+    with worker.read_front() as front:
+        set_plot_values(front.values[:front.length].copy())
+    worker = None
+    shown_position = -1
+    show_scatter(yvalues)
+    # show the final metrics, update_metrics() stops with the worker
+    dpg.set_value("text_metrics", format_metrics())
+    show_histogram()
+    # the overlays belong to the worker
+    set_overlay("compared_plot", yvalues, [])
+    set_overlay("changed_plot", yvalues, [])
+
+def push_series(tag, values, version):
+    """Send values to the series tag, decimated to the visible x range and the plot width.
 
-# increase font size for better visibility
-dpg.set_global_font_scale(1.6)
+    Args:
+        tag (str): tag of the series
+        values (numpy.ndarray): y values, the x values are their indices
+        version (int): data version of values, used as cache key together with tag
+    """
+    x = xvalues[:len(values)]
+    if plot_limits is None:
+        x_min, x_max = 0, len(values)
+    else:
+        x_min, x_max = plot_limits
+    # the plot has no size before it was rendered for the first time, use the configured width then
+    columns = dpg.get_item_rect_size("plot")[0] or dpg.get_item_width("plot")
+    timed_set_value(tag, lod_cache.get((tag, version), x, values, x_min, x_max, int(columns)))
+
+def show_scatter(values):
+    """Show new values in "scatter_plot".
 
-# create viewport
-dpg.create_viewport(title='Dear PyGui plotting sorting algorithm visualizer', width=1600, height=900)
+    Args:
+        values (numpy.ndarray): y values
+    """
+    global scatter_version
+    scatter_version += 1
+    push_series("scatter_plot", values, scatter_version)
+
+def update_lod():
+    """Called once per rendered frame. Decimates the series again if the x axis was zoomed or panned."""
+    global plot_limits
+    if not dpg.does_item_exist("x_axis"):
+        return
+    limits = tuple(dpg.get_axis_limits("x_axis"))
+    # limits are empty until the plot was rendered once
+    if limits == plot_limits or limits[1] <= limits[0]:
+        return
+    plot_limits = limits
+    if worker is not None:
+        with worker.read_front() as front:
+            show_scatter(front.values[:front.length])
+    else:
+        push_series("scatter_plot", yvalues, scatter_version)
+    push_series("line_plot", sorted_values, line_version)
 
-def sort_bubble(listx, listy, delay=0):
-    """Standard bubble sort implementation, adjusted to update Dear PyGui.
+def set_overlay(tag, values, indices):
+    """Show the points at indices of values in the overlay series tag.
 
     Args:
-        listx ([type]): list of x values for the plot
-        listy ([type]): list of y values for the plot
-        delay (int, optional): Delay in seconds between each UI update. Defaults to 0.
+        tag (str): tag of the scatter series
+        values (numpy.ndarray): current y values
+        indices ([int]): indices of the points to show
+    """
+    indices = np.array(indices, dtype=np.intp)
+    timed_set_value(tag, [xvalues[indices], values[indices]])
 
-    Returns:
-        list: sorted list of y values for the plot
+def timed_set_value(tag, value):
+    """dpg.set_value() that adds the time it took and one UI push to the run metrics.
+
+    Args:
+        tag (str): tag of the item
+        value (obj): new value of the item
     """
-    # start time
-    stime = time.time()
-    # get the length of the list for y values (x is just for updating purposes)
-    list_length = len(listy)
-
-    # look at each item in the list
-    for i in range(list_length):
-        # define sorted flag for keeping track
-        sorted_flag = True
-
-        # check remaining list elements
-        for j in range(list_length - i - 1):
-            # compare list elements
-            if listy[j] > listy[j + 1]:
-                # if the current item is bigger than the next one, swap them
-                listy[j], listy[j + 1] = listy[j + 1], listy[j]
-
-                # sorted flag needs to be False for the algorithm to keep going - only of we swapped two elements though
-                sorted_flag = False
-            # update the plot for each value to visualize progress
-            update_ui(listx, listy, delay, time.time() - stime)
-
-        # if no sorting took place, the array is sorted
-        if sorted_flag:
-            break
-    # return the sorted list - unused in this example
-    return list
-
-def sort_insertion(listx, listy, delay=0):
-    """Standard insertion sort implementation, adjusted to update Dear PyGui.
+    stime = time.perf_counter()
+    dpg.set_value(tag, value)
+    metrics.set_value_time += time.perf_counter() - stime
+    metrics.ui_pushes += 1
+
+def update_metrics(frame_time):
+    """Called once per rendered frame. Records the frame time while a sort is running and shows
+    the metrics of the run in the metrics panel.
 
     Args:
-        listx ([type]): list of x values for the plot
-        listy ([type]): list of y values for the plot
-        delay (int, optional): Delay in seconds between each UI update. Defaults to 0.
+        frame_time (float): duration of the last frame in seconds
+    """
+    if worker is None:
+        return
+    metrics.frame_times.append(frame_time)
+    metrics.frames += 1
+    dpg.set_value("text_metrics", format_metrics())
+    # the histogram does not need to be rebuilt every frame
+    if metrics.frames % 30 == 0:
+        show_histogram()
+
+def show_histogram():
+    """Show the kept frame times of the run in the frame time histogram."""
+    dpg.set_value("frame_histogram", [[t * 1000 for t in metrics.frame_times]])
+    dpg.fit_axis_data("histogram_x_axis")
+    dpg.fit_axis_data("histogram_y_axis")
+
+def collect_metrics():
+    """Collect the metrics of the current or last run from the worker and the UI side.
 
     Returns:
-        list: sorted list of y values for the plot
+        dict: all metrics, times in seconds
     """
-    # start time
-    stime = time.time()
-    # start at the second element and look through all other items
-    for i in range(1, len(listy)):
-        # get current item to be sorted
-        current_item = listy[i]
-        # index variable to find correct sorting slot
-        index = i - 1
-
-        # check the left side of the array
-        while index >= 0 and listy[index] > current_item:
-            # push one to the left
-            listy[index + 1] = listy[index]
-            index -= 1
-        # finish up by placing current item
-        listy[index + 1] = current_item
-        # update the plot for each value to visualize progress
-        update_ui(listx, listy, delay, time.time() - stime)
-
-    return listy
-
-def sort_quick(listx, listy, delay=0):
-    """Basic Quicksort implementation, adjusted to update Dear PyGui.
-    This implementation uses the helper-function quicksort() to do the recursion via a generator.
-    This isn't quite efficient or the way to visualize quicksort, but I found the results interesting,
-    so I left it in.
+    frame_times = list(metrics.frame_times)
+    run = metrics.worker
+    return {
+        "algorithm": metrics.algorithm,
+        "values": len(run.initial) if run else 0,
+        "operations": len(run.log) if run else 0,
+        "algorithm_wall_time": run.sort_time if run else None,
+        "algorithm_cpu_time": run.cpu_time if run else None,
+        "replay_time": run.replay_time if run else 0,
+        "sleep_time": run.sleep_time if run else 0,
+        "set_value_time": metrics.set_value_time,
+        "ui_pushes": metrics.ui_pushes,
+        "frames": len(frame_times),
+        "mean_frame_time": sum(frame_times) / len(frame_times) if frame_times else None,
+        "max_frame_time": max(frame_times) if frame_times else None,
+        "frame_times": frame_times,
+    }
+
+def format_metrics():
+    """Format the metrics of the current or last run for the metrics panel.
 
-    Args:
-        listx ([type]): list of x values for the plot
-        listy ([type]): list of y values for the plot
-        delay (int, optional): Delay in seconds between each UI update. Defaults to 0.
+    Returns:
+        str: one line per metric
     """
-    time_start = time.time()
-
-    # get a generator of the quicksort method
-    listgen = quicksort(listy, listy, listx)
-    framenumber = idx = 0
-    # walk through the frames and update the ui
-    # note: because of how this works, the visualization looks very un-quicksort-like
-    for frame in listgen:
-        if(len(frame) > 0):
-            for item in frame:
-                listy[idx] = item
-                update_ui(listx, listy, delay, time.time() - time_start)
-                idx += 1
-            framenumber += 1
-
-def quicksort(list, listy, listx):
-    """Helper-function for the Quicksort implementation sort_quick().
-    Yields a generator. Note: some of the contents of the generator are empty and need to be
-    accounted for.
+    collected = collect_metrics()
+    def seconds(value):
+        return "-" if value is None else f"{value:.4f}s"
+    return "\n".join([
+        f"algorithm CPU time : {seconds(collected['algorithm_cpu_time'])} (wall {seconds(collected['algorithm_wall_time'])})",
+        f"replay time        : {seconds(collected['replay_time'])}",
+        f"sleep time         : {seconds(collected['sleep_time'])}",
+        f"dpg.set_value time : {seconds(collected['set_value_time'])} in {collected['ui_pushes']} UI pushes",
+        f"frames             : {collected['frames']}, mean {seconds(collected['mean_frame_time'])}, max {seconds(collected['max_frame_time'])}",
+    ])
+
+def dump_metrics(sender, app_data):
+    """Callback for the Dump-Button. Writes the metrics of the current or last run as JSON
+    to the file in "input_metrics_file".
 
     Args:
-        list ([type]): the list to sort in this current execution
-        listy ([type]): list with the original y values
-        listx ([type]): list with the original x values
-
-    Yields:
-        generator: A python generator with each step of the sorting algorithm.
+        sender (obj): Dear PyGui sender
+        app_data (obj): App Data
     """
-    # if theres only one element remaining, we're done
-    if len(list) < 2:
-        yield list
-        return list
-
-    low, same, high = [], [], []
-
-    # select a random comparison element
-    compare = list[random.randint(0, len(list) - 1)]
-
-    # iterate the list
-    for element in list:
-        # sort the element into the corresponding new list
-        if element < compare:
-            low.append(element)
-        elif element == compare:
-            same.append(element)
-        elif element > compare:
-            high.append(element)
-
-    # finally return low, same and high
-    yield from quicksort(list=low, listx=listx, listy=listy)
-    yield same
-    yield from quicksort(list=high, listx=listx, listy=listy)
-
-def sort_stalin(listy, delay=0):
-    """A made up Stalin sort implementation, which is also a made up joke algorithm.
-    Adjusted to update DearPyGui, even though it doesn't look half as interesting.
+    filename = dpg.get_value("input_metrics_file")
+    with open(filename, "w") as metrics_file:
+        json.dump(collect_metrics(), metrics_file, indent=2)
+    dpg.set_value("text_metrics_status", f"metrics written to {filename}")
+
+def pause_sort(sender, app_data):
+    """Callback for the Pause-Button. Pauses the current sort worker."""
+    if worker is not None:
+        worker.pause()
+
+def resume_sort(sender, app_data):
+    """Callback for the Resume-Button. Resumes the current sort worker."""
+    if worker is not None:
+        worker.resume()
+
+def cancel_sort(sender, app_data):
+    """Callback for the Cancel-Button. Cancels the current sort worker, the plot keeps the last snapshot."""
+    if worker is not None:
+        worker.cancel()
+
+def update_replay_speed(sender, app_data):
+    """Callback for the replay speed inputs, applies the new values to a running worker."""
+    if worker is not None:
+        worker.steps_per_frame = dpg.get_value("input_steps")
+        worker.fps = dpg.get_value("input_fps")
+
+def update_plot():
+    """Called once per rendered frame. Pushes the newest snapshot of the sort worker to the plot,
+    but only if the worker published a new one since the last frame.
+    Every frame only the points touched by the snapshot are sent via the overlay series
+    "compared_plot" and "changed_plot". The full "scatter_plot" is refreshed every
+    "input_base_refresh" seconds and once the worker is done, decimated by show_scatter().
+    """
+    global worker
+    global shown_position
+    global base_refresh_time
+    if worker is None:
+        return
+    # only hold the worker's lock for as long as it takes to hand the data to Dear PyGui
+    with worker.read_front() as front:
+        if front.position != shown_position:
+            shown_position = front.position
+            length = front.length
+            now = time.perf_counter()
+            if front.done or now - base_refresh_time >= dpg.get_value("input_base_refresh"):
+                base_refresh_time = now
+                # slices are views, dpg reads the arrays directly without converting them to lists
+                show_scatter(front.values[:length])
+            # overlays only contain a handful of points
+            set_overlay("compared_plot", front.values, front.compared)
+            set_overlay("changed_plot", front.values, front.changed)
+            timed_set_value("text_replay", f"Replay: {front.position} / {len(front.log)} operations")
+
+    if worker.sort_time is not None:
+        timed_set_value("text_time", f"Sort time: {worker.sort_time:.4f}s, {len(worker.log)} operations")
+    state = "paused" if worker.paused else worker.state
+    timed_set_value("text_state", f"State: {state}")
+    # worker finished, the last snapshot has been shown and becomes the current data
+    if not worker.is_alive():
+        finish_worker()
+
+def record_trace(sender, app_data):
+    """Callback for the Record-Button. Writes the last sort run to the trace file in "input_trace_file".
+    Writing replays the whole log once to create the keyframes, so it runs on a sort_trace.TraceWriter,
+    update_recording() shows its progress.
 
     Args:
-        listy ([type]): list of y values for the plot
-        delay (int, optional): Delay in seconds between each UI update. Defaults to 0.
+        sender (obj): Dear PyGui sender
+        app_data (obj): App Data
     """
+    global recorder
+    run = metrics.worker
+    # the log is only complete once the algorithm finished
+    if run is None or run.sort_time is None:
+        dpg.set_value("text_trace", "sort something first, the algorithm has to finish before it can be recorded")
+        return
+    if recorder is not None and not recorder.done:
+        dpg.set_value("text_trace", f"still writing {recorder.filename}")
+        return
+    recorder = sort_trace.TraceWriter(dpg.get_value("input_trace_file"), run.initial, run.log)
+    recorder.start()
 
-    # Note: This is a joke algorithm.
-    stime = time.time()
-    
-    listlength = len(listy)
-    element = listy[0]
-    sortedlist = []
-
-    # iterate the list once, every element that is not sorted, does not belong to the list
-    for i in range(0, listlength):
-        if listy[i] >= element:
-            sortedlist.append(listy[i])
-            element = listy[i]
-            # update the ui but with only the sorted list
-        update_ui(sortedlist, sortedlist, delay, time.time() - stime)
-
-
-def sort(sender, app_data):
-    """Callback for the Sort-Button.
-    Gets current values for x and y from the plot, the delay and determines the algorithm 
-    for the sorting.
+def update_recording():
+    """Called once per rendered frame. Shows the progress of the running recording and its result."""
+    global recorder
+    if recorder is None:
+        return
+    if recorder.error is not None:
+        dpg.set_value("text_trace", f"could not write {recorder.filename}: {recorder.error}")
+        recorder = None
+    elif recorder.done:
+        dpg.set_value("text_trace", f"{len(recorder.log)} operations written to {recorder.filename}")
+        recorder = None
+    else:
+        dpg.set_value("text_trace", f"writing {recorder.filename} ... {recorder.progress:.0%}")
+
+def open_trace(sender, app_data):
+    """Callback for the Open-Button. Memory-maps the trace file in "input_trace_file", shows its
+    initial values and sets up "slider_timeline" for seeking through it.
 
     Args:
-        sender (obj): Dear PyGui sender object for the callback
+        sender (obj): Dear PyGui sender
         app_data (obj): App Data
     """
-    # get sorting algorithm
-    algo = dpg.get_value("combo_sorting")
-    # get data to sort
-    scatterx = dpg.get_value("scatter_plot")[0]
-    scattery = dpg.get_value("scatter_plot")[1]
-
-    # get the delay
-    delay = dpg.get_value("input_delay")
-
-    # Python 3.10+ can use matching patterns instead
-    if(algo == SortingAlgorithm.BUBBLE):
-        sort_bubble(scatterx, scattery, delay)
-    elif(algo == SortingAlgorithm.INSERTION):
-        sort_insertion(scatterx, scattery, delay)
-    elif(algo == SortingAlgorithm.QUICK):
-        sort_quick(scatterx, scattery, delay)
-    elif(algo == SortingAlgorithm.STALIN):
-        sort_stalin(scatterx, scattery, delay)
-
-def update_ui(listx, listy, delay, time_running):
-    """Function to update the plot "scatter_plot" and the time running text "text_time".
-    This function also sleeps for the appropriate delay.
+    global trace
+    filename = dpg.get_value("input_trace_file")
+    try:
+        trace = sort_trace.SortTrace(filename)
+    except (OSError, ValueError) as error:
+        dpg.set_value("text_trace", f"could not open {filename}: {error}")
+        return
+    stop_worker()
+    if not dpg.does_item_exist("plot"):
+        plot(sender, app_data)
+    load_values(np.array(trace.initial))
+    dpg.configure_item("slider_timeline", max_value=len(trace))
+    dpg.set_value("slider_timeline", 0)
+    dpg.set_value("text_trace", f"{filename}: {len(trace)} operations, {trace.keyframe_count} keyframes")
+
+def seek_trace(sender, app_data):
+    """Callback for "slider_timeline". Shows the state of the opened trace after the selected number
+    of operations, restored from the nearest keyframe. The state becomes the current plot data.
+
+    Args:
+        sender (obj): Dear PyGui sender
+        app_data (float): selected step
+    """
+    if trace is None:
+        return
+    stop_worker()
+    replayer = trace.replayer_at(int(app_data))
+    set_plot_values(replayer.values[:replayer.length])
+    show_scatter(yvalues)
+    set_overlay("compared_plot", yvalues, replayer.compared)
+    set_overlay("changed_plot", yvalues, replayer.changed)
+    dpg.set_value("text_replay", f"Replay: {replayer.position} / {len(trace)} operations")
+
+def start_race(sender, app_data):
+    """Callback for the Race-Button.
+    Runs every algorithm checked in the "race_" checkboxes at the same time on identical copies of
+    the current values, each in its own process via sorting.Race. Adds one subplot per algorithm
+    to "race_group", update_race() draws the progress into them. The plots of the previous race
+    are recorded in race_scope and deleted first.
 
     Args:
-        listx ([type]): list of x values for the plot
-        listy ([type]): list of y values for the plot
-        delay (int): delay to sleep in seconds
-        time_running (float): time the algorithm is running
+        sender (obj): Dear PyGui sender
+        app_data (obj): App Data
     """
-    # update the plot for each value to visualize progress
-    dpg.set_value("scatter_plot", [listx, listy])
-    # sleep for a delay if wanted
-    if delay > 0:
-        time.sleep(delay)
-    # update elapsed time
-    dpg.set_value("text_time", f"Time Running: {time_running}")
+    global race
+    names = [name for name in sorting.ALGORITHMS if dpg.get_value(f"race_{name}")]
+    if not names or len(yvalues) == 0:
+        return
+    stop_race()
+    race_scope.delete()
+    race_items.clear()
+
+    race = sorting.Race(yvalues, names)
+    # two plots per row
+    columns = min(len(names), 2)
+    rows = (len(names) + columns - 1) // columns
+    with dpg.subplots(rows, columns, label="Race", parent="race_group", width=1200, height=300 * rows, tag=race_scope.tag("subplots")):
+        for index, name in enumerate(names):
+            plot_tag = race_scope.tag("plot", index)
+            series_tag = race_scope.tag("series", index)
+            race_items.append((plot_tag, series_tag))
+            with dpg.plot(label=name, tag=plot_tag):
+                dpg.add_plot_axis(dpg.mvXAxis)
+                with dpg.plot_axis(dpg.mvYAxis):
+                    dpg.add_scatter_series([], [], tag=series_tag)
+
+def stop_race():
+    """Cancel the current race if there is one and release its processes and shared memory."""
+    global race
+    if race is not None:
+        race.close()
+        race = None
+
+def update_race():
+    """Called once per rendered frame. Draws the current values and counters of every racer,
+    read directly from the shared memory of the race processes.
+    """
+    if race is None:
+        return
+    # check before drawing, so the final state of every racer is drawn once
+    done = race.done
+    columns = 1200 // 2
+    for index, (name, (plot_tag, series_tag)) in enumerate(zip(race.names, race_items)):
+        progress = race.progress[index]
+        length = int(progress[sorting.RACE_LENGTH])
+        dpg.set_value(series_tag, list(decimation.decimate_minmax(xvalues, race.values[index], 0, length, columns)))
+        label = (f"{name}: {int(progress[sorting.RACE_COMPARISONS])} comparisons, "
+                 f"{int(progress[sorting.RACE_SWAPS])} swaps, {int(progress[sorting.RACE_WRITES])} writes")
+        if progress[sorting.RACE_DONE]:
+            label += f", done in {progress[sorting.RACE_SECONDS]:.4f}s"
+        elif race.error(index) is not None:
+            label += f", failed: {race.error(index)}"
+        dpg.configure_item(plot_tag, label=label)
+    # everything is drawn, the processes and shared memory are not needed anymore
+    if done:
+        stop_race()
 
 def plot(sender, app_data):
     """Function to plot values using Dear PyGui plots.
-    Values used are taken from Inputs "input_min", "input_max" and "input_values".
-    Generates "input_values" amount of random numbers between "input_min" and "input_max" to plot a
-    more or less random plot.
+    Values are generated by generate_plot_values().
     Adds a scatter series with the random values and a line series with the random values but sorted.
-    Plot will be added to "mainwindow".
+    Plot will be added to "plot_group" in "mainwindow".
 
     Args:
         sender (obj): Dear PyGui sender
@@ -244,91 +470,209 @@ def plot(sender, app_data):
     if dpg.does_alias_exist("plot"):
         reset(sender, app_data)
         return
-    
-    # create the plot and add it to parent "mainwindow"
-    plot_values=[]
-    min_size = dpg.get_value("input_min")
-    max_size = dpg.get_value("input_max")
-    max_value = dpg.get_value("input_values")
-    # generate random numbers
-    for i in range(max_value):
-        val = random.randint(min_size, max_size)
-        plot_values.append(val)
-
-    # create the plot
-    with dpg.plot(label="Sorting Plot", tag="plot", parent="mainwindow", height=600, width=1200):
+
+    # create the plot and add it to parent "plot_group" in "mainwindow"
+    with dpg.plot(label="Sorting Plot", tag="plot", parent="plot_group", height=600, width=1200):
         # add plot legend
         dpg.add_plot_legend()
         # add both axis
-        dpg.add_plot_axis(dpg.mvXAxis, label="x axis")
-        dpg.add_plot_axis(dpg.mvYAxis, label="y axis")
-        # x axis list
-        xlist = list(range(len(plot_values)))
-        # y axis list with sorted values (tim sort)
-        ylist = sorted(plot_values)
-        # add scatter series for random values
-        dpg.add_scatter_series(label="values to sort", tag="scatter_plot", x=xlist, y=plot_values, parent=dpg.last_item())
-        # add another axis and line series with increasing values
-        dpg.add_plot_axis(dpg.mvYAxis, label="y axis")
-        dpg.add_line_series(label="sorted values line", tag="line_plot", x=xlist, y=ylist, parent=dpg.last_item())
+        dpg.add_plot_axis(dpg.mvXAxis, label="x axis", tag="x_axis")
+        dpg.add_plot_axis(dpg.mvYAxis, label="y axis", tag="y_axis")
+        # add scatter series for random values, the data is set by show_scatter()
+        dpg.add_scatter_series(label="values to sort", tag="scatter_plot", x=[], y=[], parent="y_axis")
+        # add overlay series for the points the algorithm is working on
+        dpg.add_scatter_series(label="compared", tag="compared_plot", x=[], y=[], parent="y_axis")
+        dpg.bind_item_theme("compared_plot", "theme_compared")
+        dpg.add_scatter_series(label="changed", tag="changed_plot", x=[], y=[], parent="y_axis")
+        dpg.bind_item_theme("changed_plot", "theme_changed")
+        # add another axis and line series with increasing values (numpy sort)
+        dpg.add_plot_axis(dpg.mvYAxis, label="y axis", tag="line_y_axis")
+        dpg.add_line_series(label="sorted values line", tag="line_plot", x=[], y=[], parent="line_y_axis")
+    load_values(generate_plot_values())
+
+def generate_plot_values():
+    """Generate "input_values" values between "input_min" and "input_max" (inclusive) with the
+    distribution selected in "combo_distribution". A "input_seed" of -1 generates different values
+    every time, any other seed reproduces the same values.
+
+    Returns:
+        numpy.ndarray: float64 array of y values
+    """
+    seed = dpg.get_value("input_seed")
+    return sorting.generate_values(dpg.get_value("input_values"), dpg.get_value("combo_distribution"),
+                                   dpg.get_value("input_min"), dpg.get_value("input_max"),
+                                   None if seed < 0 else seed)
+
+def load_values(values):
+    """Replace the values shown in the existing plot, including the sorted values line.
+
+    Args:
+        values (numpy.ndarray): float64 array of y values
+    """
+    global sorted_values
+    global line_version
+    global plot_limits
+    set_plot_values(values)
+    sorted_values = np.sort(yvalues)
+    line_version += 1
+    # new values start fully zoomed out and nothing cached applies anymore
+    plot_limits = None
+    lod_cache.clear()
+    show_scatter(yvalues)
+    push_series("line_plot", sorted_values, line_version)
+    # the plot is reused, fit its axes to the new values like a new plot would be
+    dpg.fit_axis_data("x_axis")
+    dpg.fit_axis_data("y_axis")
+    dpg.fit_axis_data("line_y_axis")
+
+def set_plot_values(values):
+    """Set the current plot data. xvalues is kept as an index array at least as long as values.
+
+    Args:
+        values (numpy.ndarray): float64 array of y values
+    """
+    global xvalues
+    global yvalues
+    yvalues = values
+    # only create a new index array if there are more values, slices of it are used for fewer
+    if len(xvalues) < len(values):
+        xvalues = np.arange(len(values), dtype=np.float64)
 
 def reset(sender, app_data):
-    """Function to reset the plot. Instead of providing new values, all Dear PyGui elements and 
-    aliases are deleted and created again via plot().
+    """Function to reset the plot. The plot and its series are kept, only their data is replaced
+    with newly generated values.
 
     Args:
         sender (obj): Dear PyGui sender
         app_data (obj): App Data
     """
-    # delete all items
-    dpg.delete_item("scatter_plot")
-    dpg.delete_item("line_plot")
-    dpg.delete_item("plot")
-    # delete all aliases if necessary - dpg sometimes does not remove an alias when deleting
-    if dpg.does_alias_exist("scatter_plot"):
-        dpg.remove_alias("scatter_plot")
-    if dpg.does_alias_exist("line_plot"):
-        dpg.remove_alias("line_plot")
-    if dpg.does_alias_exist("plot"):
-        dpg.remove_alias("plot")
-    # plot a graph again
-    plot(sender, app_data)
+    # stop a running sort, it belongs to the old values
+    stop_worker()
+    # new values for the existing plot
+    load_values(generate_plot_values())
+    set_overlay("compared_plot", yvalues, [])
+    set_overlay("changed_plot", yvalues, [])
     # reset the timer
     dpg.set_value("text_time", "Time Running ...")
-
-# create mainwindow
-with dpg.window(tag="mainwindow"):
-    # width for all controls
-    def_width = 350
-    # minimum value
-    dpg.add_input_int(tag="input_min", label="minimum value", default_value=0, width=def_width)
-    # maximum value
-    dpg.add_input_int(tag="input_max", label="maximum value", default_value=100, width=def_width)
-    # amount of values to generate
-    dpg.add_input_int(tag="input_values", label="number of values to be generated", default_value=1000, width=def_width)
-    # input for delay
-    dpg.add_input_float(tag="input_delay", label="Sorting delay for each point in seconds", default_value=0,
-                        min_value=0, min_clamped=True, width=def_width)
-    # button for plotting
-    dpg.add_button(tag="button_plot", label="Plot", callback=plot, width=def_width)
-    # reset
-    dpg.add_button(tag="button_reset", label="Reset", callback=reset, width=def_width)
-    # combobox for chosing sorting algorithm
-    sa = []
-    for algo in SortingAlgorithm:
-        sa.append(algo)
-    dpg.add_combo(tag="combo_sorting", label="Sorting algorithm", items=sa, width=def_width, default_value=sa[0])
-    # label for elapsed time
-    dpg.add_text(tag="text_time", default_value="Time Running ... ")
-    # button for sorting
-    dpg.add_button(tag="button_sort", label="Sort", callback=sort, width=def_width)
-
-# finish the setup, show viewport, set primary window - maybe maximize
-dpg.setup_dearpygui()
-dpg.show_viewport()
-# maximize the window
-dpg.maximize_viewport()
-# set primary window to mainwindow
-dpg.set_primary_window("mainwindow", True)
-dpg.start_dearpygui()
-dpg.destroy_context()
+    dpg.set_value("text_replay", "")
+
+# the race processes import this file again, only the main process creates the GUI
+if __name__ == "__main__":
+    # create context
+    dpg.create_context()
+
+    # increase font size for better visibility
+    dpg.set_global_font_scale(1.6)
+
+    # create viewport
+    dpg.create_viewport(title='Dear PyGui plotting sorting algorithm visualizer', width=1600, height=900)
+
+    # themes for the overlay series, red for compared and green for changed points
+    with dpg.theme(tag="theme_compared"):
+        with dpg.theme_component(dpg.mvScatterSeries):
+            dpg.add_theme_color(dpg.mvPlotCol_MarkerFill, (255, 0, 0, 255), category=dpg.mvThemeCat_Plots)
+            dpg.add_theme_color(dpg.mvPlotCol_MarkerOutline, (255, 0, 0, 255), category=dpg.mvThemeCat_Plots)
+            dpg.add_theme_style(dpg.mvPlotStyleVar_MarkerSize, 6, category=dpg.mvThemeCat_Plots)
+    with dpg.theme(tag="theme_changed"):
+        with dpg.theme_component(dpg.mvScatterSeries):
+            dpg.add_theme_color(dpg.mvPlotCol_MarkerFill, (0, 255, 0, 255), category=dpg.mvThemeCat_Plots)
+            dpg.add_theme_color(dpg.mvPlotCol_MarkerOutline, (0, 255, 0, 255), category=dpg.mvThemeCat_Plots)
+            dpg.add_theme_style(dpg.mvPlotStyleVar_MarkerSize, 4, category=dpg.mvThemeCat_Plots)
+
+    # create mainwindow
+    with dpg.window(tag="mainwindow"):
+        # width for all controls
+        def_width = 350
+        # minimum value
+        dpg.add_input_int(tag="input_min", label="minimum value", default_value=0, width=def_width)
+        # maximum value
+        dpg.add_input_int(tag="input_max", label="maximum value", default_value=100, width=def_width)
+        # amount of values to generate
+        dpg.add_input_int(tag="input_values", label="number of values to be generated", default_value=1000, width=def_width)
+        # distribution and seed of the generated values
+        dpg.add_combo(tag="combo_distribution", label="Distribution of the values", items=sorting.DISTRIBUTIONS,
+                      default_value=sorting.DISTRIBUTIONS[0], width=def_width)
+        dpg.add_input_int(tag="input_seed", label="Seed (-1 = random)", default_value=-1, min_value=-1,
+                          min_clamped=True, width=def_width)
+        # inputs for the replay speed
+        dpg.add_input_int(tag="input_steps", label="Replayed operations per frame", default_value=100,
+                          min_value=1, min_clamped=True, width=def_width, callback=update_replay_speed)
+        dpg.add_input_int(tag="input_fps", label="Replay frames per second (0 = unlimited)", default_value=60,
+                          min_value=0, min_clamped=True, width=def_width, callback=update_replay_speed)
+        # input for how often all points are sent to the plot, in between only changed points are updated
+        dpg.add_input_float(tag="input_base_refresh", label="Full plot refresh interval in seconds", default_value=0.5,
+                            min_value=0, min_clamped=True, width=def_width)
+        # button for plotting
+        dpg.add_button(tag="button_plot", label="Plot", callback=plot, width=def_width)
+        # reset
+        dpg.add_button(tag="button_reset", label="Reset", callback=reset, width=def_width)
+        # combobox for chosing sorting algorithm
+        sa = list(sorting.ALGORITHMS)
+        dpg.add_combo(tag="combo_sorting", label="Sorting algorithm", items=sa, width=def_width, default_value=sa[0])
+        # label for elapsed time
+        dpg.add_text(tag="text_time", default_value="Time Running ... ")
+        dpg.add_text(tag="text_replay")
+        dpg.add_text(tag="text_state")
+        # button for sorting and controls for a running sort
+        with dpg.group(horizontal=True):
+            dpg.add_button(tag="button_sort", label="Sort", callback=sort, width=def_width)
+            dpg.add_button(tag="button_pause", label="Pause", callback=pause_sort)
+            dpg.add_button(tag="button_resume", label="Resume", callback=resume_sort)
+            dpg.add_button(tag="button_cancel", label="Cancel", callback=cancel_sort)
+
+        # checkboxes and button for racing several algorithms against each other
+        with dpg.collapsing_header(label="Race algorithms against each other"):
+            for name, algorithm in sorting.ALGORITHMS.items():
+                dpg.add_checkbox(tag=f"race_{name}", label=name, default_value=not algorithm.quadratic)
+            dpg.add_button(tag="button_race", label="Race", callback=start_race, width=def_width)
+
+        # live metrics of the current or last sort run
+        with dpg.collapsing_header(label="Run metrics"):
+            dpg.add_text(tag="text_metrics", default_value=format_metrics())
+            with dpg.plot(label="Frame times while sorting", height=200, width=600):
+                dpg.add_plot_axis(dpg.mvXAxis, label="frame time in ms", tag="histogram_x_axis")
+                with dpg.plot_axis(dpg.mvYAxis, label="frames", tag="histogram_y_axis"):
+                    dpg.add_histogram_series([], tag="frame_histogram", bins=50)
+            with dpg.group(horizontal=True):
+                dpg.add_input_text(tag="input_metrics_file", default_value="sort_metrics.json", width=def_width)
+                dpg.add_button(tag="button_dump_metrics", label="Dump metrics", callback=dump_metrics)
+            dpg.add_text(tag="text_metrics_status")
+
+        # recording sort runs and seeking through recorded runs
+        with dpg.collapsing_header(label="Trace recording and replay"):
+            with dpg.group(horizontal=True):
+                dpg.add_input_text(tag="input_trace_file", default_value="sort_trace.bin", width=def_width)
+                dpg.add_button(tag="button_record_trace", label="Record last run", callback=record_trace)
+                dpg.add_button(tag="button_open_trace", label="Open", callback=open_trace)
+            dpg.add_slider_double(tag="slider_timeline", label="Timeline", max_value=0, format="%.0f",
+                                  callback=seek_trace, width=1200)
+            dpg.add_text(tag="text_trace")
+
+        # containers for the sorting plot and the race subplots
+        dpg.add_group(tag="plot_group")
+        dpg.add_group(tag="race_group")
+
+    # finish the setup, show viewport, set primary window - maybe maximize
+    dpg.setup_dearpygui()
+    dpg.show_viewport()
+    # maximize the window
+    dpg.maximize_viewport()
+    # set primary window to mainwindow
+    dpg.set_primary_window("mainwindow", True)
+
+    # instead of running start_dearpygui(), we will execute the frame render manually to show sort progress
+    frame_start = time.perf_counter()
+    while dpg.is_dearpygui_running():
+        update_plot()
+        update_lod()
+        update_race()
+        update_recording()
+        dpg.render_dearpygui_frame()
+        # the time between two frames includes everything done for the frame
+        now = time.perf_counter()
+        update_metrics(now - frame_start)
+        frame_start = now
+
+    # do not leave any race processes or shared memory behind
+    stop_race()
+    dpg.destroy_context()
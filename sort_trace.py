@@ -0,0 +1,177 @@
+# binary trace files of sort runs for the plot sorting example
+# a trace holds the initial values, the operation log and a full copy of the values every
+# keyframe_interval operations, so any step can be restored without replaying the whole run
+#
+# layout (little endian, every section starts at a multiple of 8 bytes):
+#   header       MAGIC, size, operations, written values, keyframe interval, keyframes (5 x int64)
+#   initial      size x float64
+#   kinds        operations x uint8, padded
+#   first        operations x int64
+#   second       operations x int64
+#   values       written values x float64
+#   lengths      keyframes x int64, list length at each keyframe
+#   keyframes    keyframes x size x float64, values after keyframe interval * (k + 1) operations
+
+import struct
+import threading
+import numpy as np
+import sorting
+
+MAGIC = b"SORTTRC1"
+HEADER = struct.Struct("<8s5q")
+
+def _padding(length):
+    """Number of bytes needed after length bytes to reach the next multiple of 8."""
+    return -length % 8
+
+def write_trace(filename, initial, log, keyframe_interval=65536, progress=None):
+    """Write a sort run to a trace file. The keyframes are created by replaying the log once.
+
+    Args:
+        filename (str): path of the trace file
+        initial (numpy.ndarray): values before sorting
+        log (sorting.OperationLog): log recorded while sorting initial
+        keyframe_interval (int, optional): operations between two keyframes. Defaults to 65536.
+        progress (function, optional): progress(keyframes) is called after every written keyframe.
+                                       Defaults to None.
+    """
+    initial = np.ascontiguousarray(initial, dtype=np.float64)
+    operations = len(log)
+    keyframes = operations // keyframe_interval
+    with open(filename, "wb") as trace_file:
+        trace_file.write(HEADER.pack(MAGIC, len(initial), operations, len(log.values), keyframe_interval, keyframes))
+        initial.tofile(trace_file)
+        log.kinds.tofile(trace_file)
+        trace_file.write(bytes(_padding(operations)))
+        log.first.tofile(trace_file)
+        log.second.tofile(trace_file)
+        log.values.tofile(trace_file)
+
+        # replay once and remember the values at every keyframe
+        replayer = sorting.Replayer(initial, log)
+        lengths = np.zeros(keyframes, dtype=np.int64)
+        lengths_offset = trace_file.tell()
+        lengths.tofile(trace_file)
+        for k in range(keyframes):
+            replayer.step(keyframe_interval)
+            lengths[k] = replayer.length
+            replayer.values.tofile(trace_file)
+            if progress is not None:
+                progress(k + 1)
+        # the lengths are only known after replaying
+        trace_file.seek(lengths_offset)
+        lengths.tofile(trace_file)
+
+class TraceWriter(threading.Thread):
+    """Writes a sort run to a trace file with write_trace() on a background thread.
+    The UI reads progress, finished and error, the writer never touches a widget.
+    """
+
+    def __init__(self, filename, initial, log, keyframe_interval=65536):
+        """
+        Args:
+            filename (str): path of the trace file
+            initial (numpy.ndarray): values before sorting
+            log (sorting.OperationLog): log recorded while sorting initial
+            keyframe_interval (int, optional): operations between two keyframes. Defaults to 65536.
+        """
+        super().__init__(daemon=True)
+        self.filename = filename
+        self.initial = initial
+        self.log = log
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = len(log) // keyframe_interval
+        self.written_keyframes = 0
+        self.error = None
+        self.finished = False
+
+    @property
+    def progress(self):
+        """Fraction of the keyframes written so far, between 0 and 1."""
+        return self.written_keyframes / self.keyframes if self.keyframes else float(self.finished)
+
+    @property
+    def done(self):
+        return self.finished
+
+    def _written(self, keyframes):
+        self.written_keyframes = keyframes
+
+    def run(self):
+        try:
+            write_trace(self.filename, self.initial, self.log, self.keyframe_interval, self._written)
+        except OSError as error:
+            self.error = error
+        finally:
+            self.finished = True
+
+class SortTrace:
+    """Memory-mapped trace file. Only the pages needed for a step are actually read from disk.
+    Provides the same kinds, first, second and values as sorting.OperationLog, so it can be
+    replayed with sorting.Replayer.
+    """
+
+    def __init__(self, filename):
+        """
+        Args:
+            filename (str): path of a file written by write_trace()
+
+        Raises:
+            ValueError: if the file is not a trace file
+        """
+        with open(filename, "rb") as trace_file:
+            header = trace_file.read(HEADER.size)
+            trace_file.seek(0, 2)
+            file_size = trace_file.tell()
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{filename} is not a sort trace file")
+        _, size, operations, written, interval, keyframes = HEADER.unpack(header)
+        if min(size, operations, written, keyframes) < 0 or interval <= 0:
+            raise ValueError(f"{filename} has an invalid header")
+        expected = (HEADER.size + size * 8 + operations + _padding(operations) + operations * 16 + written * 8
+                    + keyframes * 8 + keyframes * size * 8)
+        if file_size < expected:
+            raise ValueError(f"{filename} is truncated, {file_size} of {expected} bytes")
+        self.filename = filename
+        self.size = size
+        self.keyframe_interval = interval
+        self.keyframe_count = keyframes
+
+        # map every section of the file, nothing is read yet
+        offset = HEADER.size
+        def section(dtype, shape):
+            nonlocal offset
+            mapped = np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=shape) if np.prod(shape) else np.zeros(shape, dtype)
+            offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+            return mapped
+        self.initial = section(np.float64, (size,))
+        self.kinds = section(np.uint8, (operations,))
+        offset += _padding(operations)
+        self.first = section(np.int64, (operations,))
+        self.second = section(np.int64, (operations,))
+        self.values = section(np.float64, (written,))
+        self.lengths = section(np.int64, (keyframes,))
+        self.keyframes = section(np.float64, (keyframes, size))
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def replayer_at(self, step):
+        """Restore the state after step operations from the nearest keyframe before it.
+
+        Args:
+            step (int): number of operations applied
+
+        Returns:
+            sorting.Replayer: replayer at position step, its highlights show the last operation
+        """
+        step = max(0, min(step, len(self)))
+        keyframe = min(step // self.keyframe_interval, self.keyframe_count)
+        if keyframe == 0:
+            replayer = sorting.Replayer(self.initial, self)
+        else:
+            replayer = sorting.Replayer(self.keyframes[keyframe - 1], self)
+            replayer.length = int(self.lengths[keyframe - 1])
+            replayer.position = keyframe * self.keyframe_interval
+        replayer.step(step - replayer.position, highlight_from=step - 1)
+        return replayer
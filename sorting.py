@@ -0,0 +1,863 @@
+# sorting algorithms for the plot sorting example
+# algorithms run at full speed and record every step into an operation log,
+# the log can then be replayed onto a copy of the input at whatever speed the UI wants
+
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+import random
+import threading
+import time
+import numpy as np
+
+# operation codes stored in OperationLog.kinds
+OP_COMPARE = 0      # compared first and second index
+OP_SWAP = 1         # swapped the values at first and second index
+OP_WRITE = 2        # wrote values[second] to first index
+OP_TRUNCATE = 3     # the list was cut down to first elements (stalin sort only)
+
+
+class OperationLog:
+    """Compact log of the operations a sorting algorithm performed.
+    Every operation is stored as one entry in three typed arrays (kind, first, second), values
+    written by OP_WRITE are stored separately and referenced by position via second.
+    """
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.first = array("q")
+        self.second = array("q")
+        self.values = array("d")
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def compare(self, i, j):
+        """Record a comparison of the elements at index i and j."""
+        self.kinds.append(OP_COMPARE)
+        self.first.append(i)
+        self.second.append(j)
+
+    def swap(self, i, j):
+        """Record a swap of the elements at index i and j."""
+        self.kinds.append(OP_SWAP)
+        self.first.append(i)
+        self.second.append(j)
+
+    def write(self, i, value):
+        """Record that value was written to index i."""
+        self.kinds.append(OP_WRITE)
+        self.first.append(i)
+        self.second.append(len(self.values))
+        self.values.append(value)
+
+    def truncate(self, length):
+        """Record that the list was cut down to length elements."""
+        self.kinds.append(OP_TRUNCATE)
+        self.first.append(length)
+        self.second.append(0)
+
+
+class OperationCounter:
+    """Drop-in replacement for OperationLog that only counts the operations.
+    Used for benchmarks, where the log itself is not needed and would cost memory.
+    """
+
+    def __init__(self):
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+
+    def __len__(self):
+        return self.comparisons + self.swaps + self.writes
+
+    def compare(self, i, j):
+        self.comparisons += 1
+
+    def swap(self, i, j):
+        self.swaps += 1
+
+    def write(self, i, value):
+        self.writes += 1
+
+    def truncate(self, length):
+        pass
+
+
+class Replayer:
+    """Applies an OperationLog step by step onto a copy of the unsorted values.
+    Used to drive the visualization independently of how fast the algorithm itself ran.
+    The values are kept in a float64 numpy array, so they can be handed to Dear PyGui as they are.
+    """
+
+    def __init__(self, initial, log):
+        """
+        Args:
+            initial (numpy.ndarray): the values before sorting, will be copied
+            log (OperationLog): the log recorded while sorting the same values
+        """
+        self.values = np.array(initial, dtype=np.float64)
+        self.length = len(self.values)
+        self.log = log
+        self.position = 0
+        # indices of the last comparison and of all values changed by the last step
+        self.compared = []
+        self.changed = []
+
+    @property
+    def done(self):
+        return self.position >= len(self.log)
+
+    def step(self, count, highlight_from=None):
+        """Apply the next count operations to self.values.
+        Updates self.compared and self.changed for the operations starting at highlight_from.
+
+        Args:
+            count (int): maximum number of operations to apply
+            highlight_from (int, optional): first operation to collect highlights for. Defaults to all applied operations.
+
+        Returns:
+            int: number of operations actually applied
+        """
+        log = self.log
+        values = self.values
+        written = log.values
+        start = self.position
+        stop = min(start + count, len(log))
+        # slicing the typed arrays once is a lot cheaper than indexing all three per operation
+        for kind, i, j in zip(log.kinds[start:stop], log.first[start:stop], log.second[start:stop]):
+            if kind == OP_SWAP:
+                values[i], values[j] = values[j], values[i]
+            elif kind == OP_WRITE:
+                values[i] = written[j]
+            elif kind == OP_TRUNCATE:
+                self.length = i
+            # comparisons do not change any values
+        self._collect_highlights(max(start, highlight_from or 0), stop)
+        applied = stop - self.position
+        self.position = stop
+        return applied
+
+    def _collect_highlights(self, start, stop):
+        """Collect the last compared pair and all changed indices of the operations start to stop."""
+        log = self.log
+        compared = []
+        changed = set()
+        for kind, i, j in zip(log.kinds[start:stop], log.first[start:stop], log.second[start:stop]):
+            if kind == OP_COMPARE:
+                compared = [i, j]
+            elif kind == OP_SWAP:
+                changed.add(i)
+                changed.add(j)
+            elif kind == OP_WRITE:
+                changed.add(i)
+        # nothing past a truncation can be shown
+        self.compared = [i for i in compared if i < self.length]
+        self.changed = sorted(i for i in changed if i < self.length)
+
+
+class SortCancelled(Exception):
+    """Raised inside the algorithm when a SortWorker gets cancelled."""
+
+
+class _WorkerLog(OperationLog):
+    """OperationLog that lets a SortWorker pause or cancel the algorithm on every comparison.
+    Every algorithm compares regularly, so checking there is enough and keeps the other operations cheap.
+    """
+
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
+
+    def compare(self, i, j):
+        # plain attribute check, only block or raise if pause() or cancel() was called
+        if self.worker.interrupted:
+            self.worker.checkpoint()
+        super().compare(i, j)
+
+
+class SortWorker(threading.Thread):
+    """Background thread running a sort and replaying it into two alternating buffers.
+    The thread first runs the algorithm at full speed, then replays the recorded log with
+    steps_per_frame operations per published snapshot and at most fps snapshots per second.
+    Snapshots are double buffered: the replay writes into the back buffer only and swaps it to
+    the front when done, the UI reads the front buffer via read_front() while holding the lock.
+    """
+
+    def __init__(self, values, sort_function, steps_per_frame=100, fps=60):
+        """
+        Args:
+            values (numpy.ndarray): the values to sort, will be copied
+            sort_function (function): one of the sort_* functions of this module
+            steps_per_frame (int, optional): operations replayed per snapshot. Defaults to 100.
+            fps (int, optional): maximum snapshots per second, 0 for unlimited. Defaults to 60.
+        """
+        super().__init__(daemon=True)
+        self.initial = np.array(values, dtype=np.float64)
+        self.sort_function = sort_function
+        self.steps_per_frame = steps_per_frame
+        self.fps = fps
+        self.log = _WorkerLog(self)
+        # wall time and CPU time of the algorithm itself, time spent applying the log and sleeping between snapshots
+        self.sort_time = None
+        self.cpu_time = None
+        self.replay_time = 0
+        self.sleep_time = 0
+        self.state = "sorting"
+        # flag checked by the algorithm, set whenever pause() or cancel() was called
+        self.interrupted = False
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._cancelled = False
+        self._paused_time = 0
+        # two replayers over the same log make up the double buffer
+        self._buffers = [Replayer(self.initial, self.log), Replayer(self.initial, self.log)]
+        self._front = 0
+        self._lock = threading.Lock()
+
+    def pause(self):
+        """Pause sorting or replaying until resume() is called."""
+        self._resumed.clear()
+        self.interrupted = True
+
+    def resume(self):
+        """Continue after pause()."""
+        self.interrupted = self._cancelled
+        self._resumed.set()
+
+    def cancel(self):
+        """Stop the worker, it will finish with state "cancelled"."""
+        self._cancelled = True
+        self.interrupted = True
+        self._resumed.set()
+
+    @property
+    def paused(self):
+        return not self._resumed.is_set()
+
+    def checkpoint(self):
+        """Block while paused and raise SortCancelled when cancelled. Called from the worker thread."""
+        if not self._resumed.is_set():
+            pause_start = time.perf_counter()
+            self._resumed.wait()
+            self._paused_time += time.perf_counter() - pause_start
+        if self._cancelled:
+            raise SortCancelled()
+
+    @contextmanager
+    def read_front(self):
+        """Context manager yielding the Replayer of the newest completed snapshot.
+        The worker will not swap buffers while the context is open.
+        """
+        with self._lock:
+            yield self._buffers[self._front]
+
+    def run(self):
+        try:
+            # run the algorithm on its own copy without any UI involvement
+            # note: a plain list is a lot faster than a numpy array for element-wise python code
+            listy = self.initial.tolist()
+            stime = time.perf_counter()
+            cpu_start = time.thread_time()
+            self.sort_function(listy, self.log)
+            self.cpu_time = time.thread_time() - cpu_start
+            self.sort_time = time.perf_counter() - stime - self._paused_time
+
+            # replay into the back buffer and publish it
+            self.state = "replaying"
+            while not self._buffers[self._front].done:
+                self.checkpoint()
+                frame_start = time.perf_counter()
+                front = self._buffers[self._front]
+                back = self._buffers[1 - self._front]
+                # catch up with the front buffer, then apply the next operations
+                # only the new operations count for the highlights of the snapshot
+                back.step(front.position - back.position + self.steps_per_frame, highlight_from=front.position)
+                with self._lock:
+                    self._front = 1 - self._front
+                self.replay_time += time.perf_counter() - frame_start
+                # wait for the next frame
+                if self.fps > 0:
+                    delay = max(0, 1 / self.fps - (time.perf_counter() - frame_start))
+                    time.sleep(delay)
+                    self.sleep_time += delay
+            self.state = "done"
+        except SortCancelled:
+            self.state = "cancelled"
+
+
+# progress counters a race process publishes behind its values in shared memory
+RACE_FIELDS = ["comparisons", "swaps", "writes", "length", "seconds", "done", "cancel"]
+RACE_COMPARISONS, RACE_SWAPS, RACE_WRITES, RACE_LENGTH, RACE_SECONDS, RACE_DONE, RACE_CANCEL = range(len(RACE_FIELDS))
+
+
+class _RaceLog(OperationCounter):
+    """OperationCounter that mirrors every change into a shared memory array and publishes
+    its counters every 4096 comparisons. Used by _race_worker() in the race processes.
+    """
+
+    def __init__(self, values, progress):
+        super().__init__()
+        self.values = values
+        self.progress = progress
+
+    def flush(self):
+        """Publish the counters and stop the algorithm if the race was cancelled."""
+        self.progress[RACE_COMPARISONS] = self.comparisons
+        self.progress[RACE_SWAPS] = self.swaps
+        self.progress[RACE_WRITES] = self.writes
+        if self.progress[RACE_CANCEL]:
+            raise SortCancelled()
+
+    def compare(self, i, j):
+        self.comparisons += 1
+        if self.comparisons & 4095 == 0:
+            self.flush()
+
+    def swap(self, i, j):
+        self.swaps += 1
+        values = self.values
+        values[i], values[j] = values[j], values[i]
+
+    def write(self, i, value):
+        self.writes += 1
+        self.values[i] = value
+
+    def truncate(self, length):
+        self.progress[RACE_LENGTH] = length
+
+
+def _race_worker(name, memory_name, size):
+    """Runs in a race process. Sorts the values in the shared memory block memory_name with the
+    algorithm name and publishes the progress behind them.
+
+    Args:
+        name (str): name of the algorithm in ALGORITHMS
+        memory_name (str): name of the shared memory block created by Race
+        size (int): number of values in the block
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    data = log = None
+    try:
+        data = np.ndarray(size + len(RACE_FIELDS), dtype=np.float64, buffer=memory.buf)
+        log = _RaceLog(data[:size], data[size:])
+        # the algorithm compares on a fast list, the log mirrors every change into shared memory
+        listy = data[:size].tolist()
+        stime = time.perf_counter()
+        try:
+            ALGORITHMS[name].function(listy, log)
+        except SortCancelled:
+            pass
+        log.progress[RACE_SECONDS] = time.perf_counter() - stime
+        log.progress[RACE_DONE] = 1
+        log.flush()
+    except SortCancelled:
+        pass
+    finally:
+        # all views into the block have to be gone before it can be closed
+        del data, log
+        memory.close()
+
+
+class Race:
+    """Runs several algorithms at the same time on identical copies of the values, each in its own process.
+    Every algorithm sorts its own shared memory block, so the values and progress counters can be
+    read by the UI at any time without copying anything between processes.
+    """
+
+    def __init__(self, values, names):
+        """
+        Args:
+            values (numpy.ndarray): values every algorithm starts with
+            names ([str]): names of the algorithms in ALGORITHMS
+        """
+        self.names = list(names)
+        self.size = len(values)
+        self.values = []
+        self.progress = []
+        self._memory = []
+        for name in self.names:
+            memory = shared_memory.SharedMemory(create=True, size=(self.size + len(RACE_FIELDS)) * 8)
+            data = np.ndarray(self.size + len(RACE_FIELDS), dtype=np.float64, buffer=memory.buf)
+            data[:self.size] = values
+            data[self.size:] = 0
+            data[self.size + RACE_LENGTH] = self.size
+            self._memory.append(memory)
+            self.values.append(data[:self.size])
+            self.progress.append(data[self.size:])
+        # spawn instead of fork, forking a process with a running GUI is asking for trouble
+        self._executor = ProcessPoolExecutor(max_workers=min(len(self.names), os.cpu_count() or 1),
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._futures = [self._executor.submit(_race_worker, name, memory.name, self.size)
+                         for name, memory in zip(self.names, self._memory)]
+
+    @property
+    def done(self):
+        return all(future.done() for future in self._futures)
+
+    def error(self, index):
+        """Exception raised by the process of racer index, None if it is still running or succeeded."""
+        future = self._futures[index]
+        return future.exception() if future.done() else None
+
+    def cancel(self):
+        """Ask all processes to stop, they check this every 4096 comparisons."""
+        for progress in self.progress:
+            progress[RACE_CANCEL] = 1
+
+    def close(self):
+        """Cancel the race, wait for all processes and release the shared memory."""
+        self.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        # all views into the blocks have to be gone before they can be closed
+        self.values.clear()
+        self.progress.clear()
+        for memory in self._memory:
+            memory.close()
+            memory.unlink()
+        self._memory.clear()
+
+
+# input distributions supported by generate_values()
+DISTRIBUTIONS = ["random", "sorted", "reversed", "few-unique", "sawtooth"]
+
+def generate_values(size, distribution="random", low=0, high=100, seed=None):
+    """Generate values to sort, vectorized with numpy.
+
+    Args:
+        size (int): number of values
+        distribution (str, optional): one of DISTRIBUTIONS. Defaults to "random".
+        low (int, optional): smallest possible value. Defaults to 0.
+        high (int, optional): biggest possible value (inclusive). Defaults to 100.
+        seed (int, optional): seed for reproducible values. Defaults to None.
+
+    Returns:
+        numpy.ndarray: float64 array with size values
+    """
+    rng = np.random.default_rng(seed)
+    if distribution == "random":
+        values = rng.integers(low, high, size=size, endpoint=True)
+    elif distribution == "sorted":
+        values = np.sort(rng.integers(low, high, size=size, endpoint=True))
+    elif distribution == "reversed":
+        values = np.sort(rng.integers(low, high, size=size, endpoint=True))[::-1]
+    elif distribution == "few-unique":
+        # pick a handful of distinct values and repeat them
+        unique = rng.integers(low, high, size=5, endpoint=True)
+        values = unique[rng.integers(0, len(unique), size=size)]
+    elif distribution == "sawtooth":
+        # 8 ascending runs covering the whole value range
+        period = max(size // 8, 1)
+        values = low + (np.arange(size) % period) * (high - low) // period
+    else:
+        raise ValueError(f"unknown distribution {distribution}")
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+# registry of all sorting algorithms, in the order they are shown in the UI
+ALGORITHMS = {}
+
+# registry entry for one sorting algorithm
+# quadratic marks algorithms that are only usable on small inputs
+SortingAlgorithm = namedtuple("SortingAlgorithm", ["name", "function", "quadratic"])
+
+def register(name, quadratic=False):
+    """Decorator adding a sort function to ALGORITHMS.
+    A sort function takes the list to sort in place and an OperationLog to record into.
+
+    Args:
+        name (str): name of the algorithm shown in the UI
+        quadratic (bool, optional): whether the algorithm needs O(n^2) operations. Defaults to False.
+    """
+    def decorator(function):
+        ALGORITHMS[name] = SortingAlgorithm(name, function, quadratic)
+        return function
+    return decorator
+
+def _swap(listy, i, j, log):
+    """Swap two elements and record the swap, unless both indices are the same."""
+    if i != j:
+        listy[i], listy[j] = listy[j], listy[i]
+        log.swap(i, j)
+
+
+@register("Bubble Sort", quadratic=True)
+def sort_bubble(listy, log):
+    """Standard bubble sort implementation, recording every step into log.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    # get the length of the list
+    list_length = len(listy)
+
+    # look at each item in the list
+    for i in range(list_length):
+        # define sorted flag for keeping track
+        sorted_flag = True
+
+        # check remaining list elements
+        for j in range(list_length - i - 1):
+            # compare list elements
+            log.compare(j, j + 1)
+            if listy[j] > listy[j + 1]:
+                # if the current item is bigger than the next one, swap them
+                listy[j], listy[j + 1] = listy[j + 1], listy[j]
+                log.swap(j, j + 1)
+
+                # sorted flag needs to be False for the algorithm to keep going - only of we swapped two elements though
+                sorted_flag = False
+
+        # if no sorting took place, the array is sorted
+        if sorted_flag:
+            break
+
+@register("Insertion Sort", quadratic=True)
+def sort_insertion(listy, log):
+    """Standard insertion sort implementation, recording every step into log.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    _insertion_range(listy, 0, len(listy) - 1, log)
+
+def _insertion_range(listy, lo, hi, log):
+    """Insertion sort of listy[lo:hi + 1], also used for small ranges by sort_intro()."""
+    # start at the second element and look through all other items
+    for i in range(lo + 1, hi + 1):
+        # get current item to be sorted
+        current_item = listy[i]
+        # index variable to find correct sorting slot
+        index = i - 1
+
+        # check the left side of the array
+        while index >= lo:
+            log.compare(index, index + 1)
+            if listy[index] <= current_item:
+                break
+            # push one to the left
+            listy[index + 1] = listy[index]
+            log.write(index + 1, listy[index])
+            index -= 1
+        # finish up by placing current item
+        listy[index + 1] = current_item
+        log.write(index + 1, current_item)
+
+@register("Quick Sort (3-way)")
+def sort_quick_3way(listy, log):
+    """In-place quicksort using a three-way (Dutch national flag) partition with a random pivot.
+    Copies of the pivot are not sorted again, so inputs with many repeated values stay fast.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    _quicksort_inplace(listy, log, _partition_3way)
+
+@register("Quick Sort (Hoare)")
+def sort_quick_hoare(listy, log):
+    """In-place quicksort using the Hoare partition scheme with the middle element as pivot.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    _quicksort_inplace(listy, log, _partition_hoare)
+
+def _quicksort_inplace(listy, log, partition):
+    """Quicksort driver using an explicit stack instead of recursion.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+        partition (function): _partition_3way() or _partition_hoare(), returns the last index
+                              of the left part and the first index of the right part
+    """
+    stack = [(0, len(listy) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if lo >= hi:
+            continue
+        left_end, right_start = partition(listy, lo, hi, log)
+        left = (lo, left_end)
+        right = (right_start, hi)
+        # push the bigger part first, so the stack never grows beyond log(n) entries
+        if left[1] - left[0] > right[1] - right[0]:
+            stack.append(left)
+            stack.append(right)
+        else:
+            stack.append(right)
+            stack.append(left)
+
+def _partition_3way(listy, lo, hi, log):
+    """Three-way partition of listy[lo:hi + 1] around a random pivot: smaller values to the left,
+    copies of the pivot in the middle, bigger values to the right.
+
+    Returns:
+        (int, int): last index of the smaller part and first index of the bigger part
+    """
+    # move a random pivot to the front, listy[lt:i] holds the copies of the pivot found so far
+    _swap(listy, random.randint(lo, hi), lo, log)
+    pivot = listy[lo]
+    lt = lo
+    i = lo + 1
+    gt = hi
+    while i <= gt:
+        # listy[lt] is always a copy of the pivot, the log compares against it
+        log.compare(i, lt)
+        if listy[i] < pivot:
+            _swap(listy, i, lt, log)
+            lt += 1
+            i += 1
+            continue
+        log.compare(i, lt)
+        if listy[i] > pivot:
+            _swap(listy, i, gt, log)
+            gt -= 1
+        else:
+            i += 1
+    return lt - 1, gt + 1
+
+def _partition_hoare(listy, lo, hi, log):
+    """Hoare partition of listy[lo:hi + 1] around the middle element.
+
+    Returns:
+        (int, int): last index of the left part and the index after it, everything up to it is <= everything after it
+    """
+    p = (lo + hi) // 2
+    pivot = listy[p]
+    i = lo - 1
+    j = hi + 1
+    while True:
+        # find an element on the left that belongs to the right
+        i += 1
+        log.compare(i, p)
+        while listy[i] < pivot:
+            i += 1
+            log.compare(i, p)
+        # find an element on the right that belongs to the left
+        j -= 1
+        log.compare(j, p)
+        while listy[j] > pivot:
+            j -= 1
+            log.compare(j, p)
+        if i >= j:
+            return j, j + 1
+        _swap(listy, i, j, log)
+        # keep track of where the pivot went, so the log compares against its actual index
+        if p == i:
+            p = j
+        elif p == j:
+            p = i
+
+@register("Introsort")
+def sort_intro(listy, log):
+    """Introsort: Hoare quicksort that switches to heapsort when the partitions get too unbalanced
+    and to insertion sort for small ranges.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    depth_limit = 2 * max(len(listy), 1).bit_length()
+    stack = [(0, len(listy) - 1, depth_limit)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo < 16:
+            _insertion_range(listy, lo, hi, log)
+        elif depth == 0:
+            _heapsort_range(listy, lo, hi, log)
+        else:
+            left_end, right_start = _partition_hoare(listy, lo, hi, log)
+            stack.append((lo, left_end, depth - 1))
+            stack.append((right_start, hi, depth - 1))
+
+@register("Heap Sort")
+def sort_heap(listy, log):
+    """Standard heapsort implementation, recording every step into log.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    _heapsort_range(listy, 0, len(listy) - 1, log)
+
+def _heapsort_range(listy, lo, hi, log):
+    """Heapsort of listy[lo:hi + 1], also used as fallback by sort_intro()."""
+    end = hi + 1
+    # build a max heap
+    for root in range(lo + (end - lo) // 2 - 1, lo - 1, -1):
+        _sift_down(listy, lo, root, end, log)
+    # move the maximum to the end and restore the heap in front of it
+    for last in range(hi, lo, -1):
+        _swap(listy, lo, last, log)
+        _sift_down(listy, lo, lo, last, log)
+
+def _sift_down(listy, lo, root, end, log):
+    """Move listy[root] down the heap starting at lo until the heap property holds up to end."""
+    while True:
+        child = 2 * (root - lo) + 1 + lo
+        if child >= end:
+            return
+        # pick the bigger child
+        if child + 1 < end:
+            log.compare(child, child + 1)
+            if listy[child] < listy[child + 1]:
+                child += 1
+        log.compare(root, child)
+        if listy[root] >= listy[child]:
+            return
+        _swap(listy, root, child, log)
+        root = child
+
+@register("Shell Sort")
+def sort_shell(listy, log):
+    """Shell sort using the Ciura gap sequence, extended by a factor of 2.25 for long lists.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    gaps = [1, 4, 10, 23, 57, 132, 301, 701]
+    while gaps[-1] * 2.25 < len(listy):
+        gaps.append(int(gaps[-1] * 2.25))
+    for gap in reversed(gaps):
+        # insertion sort of every gap-th element
+        for i in range(gap, len(listy)):
+            current_item = listy[i]
+            index = i
+            while index >= gap:
+                log.compare(index - gap, index)
+                if listy[index - gap] <= current_item:
+                    break
+                listy[index] = listy[index - gap]
+                log.write(index, listy[index])
+                index -= gap
+            if index != i:
+                listy[index] = current_item
+                log.write(index, current_item)
+
+@register("Merge Sort")
+def sort_merge(listy, log):
+    """Bottom-up merge sort. The left run is copied to a buffer and merged back into the list.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    length = len(listy)
+    width = 1
+    while width < length:
+        for lo in range(0, length, 2 * width):
+            mid = min(lo + width, length)
+            hi = min(lo + 2 * width, length)
+            if mid >= hi:
+                continue
+            left = listy[lo:mid]
+            i = 0
+            j = mid
+            k = lo
+            while i < len(left) and j < hi:
+                log.compare(k, j)
+                if left[i] <= listy[j]:
+                    listy[k] = left[i]
+                    i += 1
+                else:
+                    listy[k] = listy[j]
+                    j += 1
+                log.write(k, listy[k])
+                k += 1
+            # whatever is left of the right run is already in place
+            while i < len(left):
+                listy[k] = left[i]
+                log.write(k, listy[k])
+                i += 1
+                k += 1
+        width *= 2
+
+@register("Generator Quick Sort")
+def sort_quick(listy, log):
+    """Basic Quicksort implementation, recording every step into log.
+    This implementation uses the helper-function quicksort() to do the recursion via a generator
+    and writes the yielded fragments back to the list from left to right.
+    This isn't quite the way quicksort works, but I found the results interesting, so I left it in.
+    See sort_quick_3way() and sort_quick_hoare() for the real thing.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    idx = 0
+    # walk through the fragments and write them back
+    # note: because of how this works, the visualization looks very un-quicksort-like
+    for frame in quicksort(list(listy)):
+        for item in frame:
+            listy[idx] = item
+            log.write(idx, item)
+            idx += 1
+
+def quicksort(list):
+    """Helper-function for the Quicksort implementation sort_quick().
+    Yields a generator. Note: some of the contents of the generator are empty and need to be
+    accounted for.
+
+    Args:
+        list ([type]): the list to sort in this current execution
+
+    Yields:
+        generator: A python generator with each step of the sorting algorithm.
+    """
+    # if theres only one element remaining, we're done
+    if len(list) < 2:
+        yield list
+        return
+
+    low, same, high = [], [], []
+
+    # select a random comparison element
+    compare = list[random.randint(0, len(list) - 1)]
+
+    # iterate the list
+    for element in list:
+        # sort the element into the corresponding new list
+        if element < compare:
+            low.append(element)
+        elif element == compare:
+            same.append(element)
+        elif element > compare:
+            high.append(element)
+
+    # finally return low, same and high
+    yield from quicksort(low)
+    yield same
+    yield from quicksort(high)
+
+@register("Stalin Sort")
+def sort_stalin(listy, log):
+    """A made up Stalin sort implementation, which is also a made up joke algorithm.
+    Every element smaller than its predecessor is removed, the survivors are moved to the front
+    and the list is truncated.
+
+    Args:
+        listy ([type]): list of y values, sorted in place
+        log (OperationLog): log to record the operations into
+    """
+    # Note: This is a joke algorithm.
+    if len(listy) == 0:
+        return
+    kept = 1
+    # iterate the list once, every element that is not sorted, does not belong to the list
+    for i in range(1, len(listy)):
+        log.compare(kept - 1, i)
+        if listy[i] >= listy[kept - 1]:
+            listy[kept] = listy[i]
+            log.write(kept, listy[i])
+            kept += 1
+    # get rid of everything that did not make it
+    del listy[kept:]
+    log.truncate(kept)
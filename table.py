@@ -1,8 +1,56 @@
 # Dear PyGui basic table example
 # table creation and cell editing
-# no import or export functionality
+# the table is virtualized: only the rows visible on screen exist as widgets and get
+# reused for other rows when scrolling, so the row count does not matter for memory or build time
+# CSV files are imported and exported in chunks on background threads, imported rows are
+# added to the table in batches per frame, so the UI keeps running with huge files
 
 import dearpygui.dearpygui as dpg
+import numpy as np
+import time
+import table_csv
+import table_index
+import table_store
+import tag_scope
+
+# number of row widgets, the table never shows more rows than this at once
+VISIBLE_ROWS = 20
+# maximum columns accepted by DearPyGui tables in this example, wider CSV files are cut off
+MAX_COLUMNS = 50
+# seconds per frame spent on adding imported rows to the table
+CSV_FRAME_BUDGET = 0.008
+
+def default_text(row, column):
+    """Text of cells that were never edited."""
+    return f"row{row} column{column}"
+
+# table data, the widgets only show the rows starting at first_row
+store = table_store.TableStore(default=default_text)
+# sort and filter indexes of store, replaced together with store in create_table()
+index = table_index.TableIndex(store)
+# sorted and/or filtered rows of store in display order, None shows all rows as stored
+view = None
+# (column, descending) of the header clicked last, None if the table is not sorted
+sort_spec = None
+# column number of every header column id, for the sort callback
+column_numbers = {}
+# (slot, column, store row) of the cell shown in "cell_editor", None if no cell is edited
+editing = None
+# edits not written to store yet as (row, column, text), applied in batches by apply_changes()
+pending_changes = []
+# all applied edits as (row, column, old text, new text)
+change_log = []
+first_row = 0
+# number of row widgets ("slots") currently in the table
+slots = 0
+# index between cell widgets and their position: cell_widgets[slot][column] is the widget id,
+# widget_cells[widget id] is (slot, column)
+cell_widgets = []
+widget_cells = {}
+# all items of the table, deleted together by delete_table()
+table_scope = tag_scope.TagScope("table")
+# running CSV import (table_csv.CsvReader) or export (table_csv.CsvWriter), None if there is none
+csv_job = None
 
 # create context
 dpg.create_context()
@@ -24,53 +72,122 @@ def show_status_update(statusmessage, color=(255, 255, 255, 255)):
     dpg.configure_item("status_text", color=color)
     dpg.set_value("status_text", f"current status: {statusmessage}")
 
+def add_slot():
+    """Function for adding a row widget ("slot") to the table "maintable". Cells all share the
+    click handler registry "cell_handler" and are found through the index cell_widgets / widget_cells
+    instead of tags, so no tag has to be parsed when a cell is clicked.
+    """
+    global slots
+    widgets = []
+    with dpg.table_row(parent="maintable", tag=table_scope.tag("row", slots)):
+        for i in range(0, store.column_count):
+            # add text field to table, in a group the editor can be moved into
+            with dpg.group():
+                cell = dpg.add_text()
+            # one handler registry for all cells, the clicked cell is passed to the callback
+            dpg.bind_item_handler_registry(cell, "cell_handler")
+            widgets.append(cell)
+            widget_cells[cell] = (slots, i)
+    cell_widgets.append(widgets)
+    slots += 1
+
+def row_count():
+    """Number of rows shown, all rows of store or only the rows left by the filter."""
+    return store.row_count if view is None else len(view)
+
+def store_row(row):
+    """Row of store shown at a position of the table.
+
+    Args:
+        row (int): position in the sorted and filtered table
+
+    Returns:
+        int: row in store
+    """
+    return row if view is None else int(view[row])
+
+def refresh_rows():
+    """Show the rows starting at first_row in the row widgets and update the scrollbar.
+    Row widgets after the last shown row are left empty.
+    """
+    count = row_count()
+    for slot, widgets in enumerate(cell_widgets):
+        row = first_row + slot
+        if row < count:
+            row = store_row(row)
+            for i, cell in enumerate(widgets):
+                dpg.set_value(cell, store.get(row, i))
+        else:
+            for cell in widgets:
+                dpg.set_value(cell, "")
+    # vertical sliders have their minimum at the bottom
+    max_first_row = max(count - slots, 0)
+    dpg.configure_item("table_scroll", max_value=max_first_row)
+    dpg.set_value("table_scroll", max_first_row - first_row)
+    dpg.set_value("table_position", f"rows {first_row} to {min(first_row + slots, count) - 1} of {count}")
+
+def scroll_to(row):
+    """Scroll the table so that row is the first row shown, as far as possible.
+
+    Args:
+        row (int): row to show in the first row widget
+    """
+    global first_row
+    # the edited cell would show another row after scrolling
+    commit_edit()
+    first_row = max(0, min(row, row_count() - slots))
+    refresh_rows()
+
+def scroll_slider(sender, app_data):
+    """Callback for the vertical slider "table_scroll" next to the table."""
+    scroll_to(max(row_count() - slots, 0) - app_data)
+
+def scroll_wheel(sender, app_data):
+    """Mouse wheel handler, scrolls the table by three rows per step while the mouse is over it."""
+    if dpg.does_item_exist("maintable") and dpg.is_item_hovered("maintable"):
+        scroll_to(first_row - 3 * int(app_data))
+
 def add_row():
-    """Function for adding rows to the table "maintable". Also adds the click handler to the label 
-    for each cell. Number of columns is pulled via global variable columns. Global variable 
-    rows gets updated after the row is added.
-    """
-    global rows
-    with dpg.table_row(parent="maintable"):
-        for i in range(0, columns):
-            # add text field to table
-            dpg.add_text(f"row{rows} column{i}", tag=f"cell_{rows}{i}")
-            # add click handler to text field / cell
-            with dpg.item_handler_registry(tag=f"cell_handler_{rows}{i}") as handler:
-                dpg.add_item_clicked_handler(callback=cell_edit)
-            dpg.bind_item_handler_registry(f"cell_{rows}{i}", f"cell_handler_{rows}{i}")
-    rows += 1
+    """Function for adding rows to the table "maintable". Adds a row widget as long as there are
+    fewer than VISIBLE_ROWS, otherwise the new row is reached by scrolling.
+    If the table is sorted or filtered, the new row is shown at the end until the view is updated.
+    """
+    global view
+    store.add_rows(1)
+    if view is not None:
+        view = np.append(view, store.row_count - 1)
+    if slots < VISIBLE_ROWS:
+        add_slot()
+    refresh_rows()
 
 def delete_table():
-    """Function to delete the table "maintable".
-    Resets global variables rows and columns to 0.
-    Since DearPyGui sometimes does not remove an alias upon deletion, the function 
-    includes deletion of all aliases starting with "row_", "col_" or "cell_".
-    """
-    # delete main table
-    dpg.delete_item("maintable")
-    # reset counters
-    global rows
-    global columns
-    rows = 0
-    columns = 0
-
-    # sometimes some aliases will not be removed upon item deletion
-    # I found no intended way to deal with this, so all prefixes must be deleted manually
-    to_delete = []
-    for alias in dpg.get_aliases():
-        # rows / columns / cells
-        if alias.startswith("row_") or alias.startswith("col_") or alias.startswith("cell_"):
-            to_delete.append(alias)
-    # delete marked aliases
-    for alias in to_delete:
-        dpg.remove_alias(alias)
-
-def create_table(colcount=3, rowcount=3):
+    """Function to delete the table "maintable" and its data.
+    Only the items recorded in table_scope are deleted, including aliases
+    DearPyGui sometimes does not remove upon deletion.
+    """
+    # keep the editor and the edits, they are not part of the table
+    commit_edit()
+    apply_changes()
+    # delete main table, its scrollbar and all recorded rows / columns
+    table_scope.delete()
+    # reset data and widget index
+    global store
+    global first_row
+    global slots
+    store = table_store.TableStore(default=default_text)
+    first_row = 0
+    slots = 0
+    cell_widgets.clear()
+    widget_cells.clear()
+
+def create_table(colcount=3, rowcount=3, names=None, dtypes=None):
     """Function to create a table with a specified row and column count.
     Header-columns get automatically added, labelled with "column" and an incrementing number.
+    Only up to VISIBLE_ROWS row widgets are created, no matter how big rowcount is.
     After the creation, show_status_update() is invoked with information for the user.
 
-    Global variables columns and rows will be reset and adjusted.
+    The data is held in store, which gets one column per table column, text unless dtypes says otherwise.
+    Rows added to store later, e.g. by a CSV import, get row widgets through add_slot().
 
     Table will be added to "mainwindow" and have the tag "maintable".
 
@@ -79,25 +196,51 @@ def create_table(colcount=3, rowcount=3):
     Args:
         colcount (int, optional): Number of columns for the table. Defaults to 3.
         rowcount (int, optional): Number of rows for the table. Defaults to 3.
+        names ([str], optional): Header labels, overrides colcount. Defaults to "column" and the column number.
+        dtypes ([str], optional): table_store.DTYPES of the columns, float columns only accept numbers.
+                                  Defaults to text columns.
     """
-    # remember variables if needed
-    global columns
-    global rows
-    columns = colcount  # columns can always stay the same for now
-    rows = 0            # rows start at 0 and will be counted up by add_row()
-    # create table
-    with dpg.table(parent="mainwindow", header_row=True, resizable=True, policy=dpg.mvTable_SizingStretchProp,
-                   borders_outerH=True, borders_innerV=True, borders_innerH=True, borders_outerV=True,
-                   tag="maintable", row_background=True):
-
-        # add header columns
-        for i in range(0, colcount):
-            dpg.add_table_column(tag=f"col_{i}", label=f"column {i}")
-
-        # add rows and cells
-        for i in range(0, rowcount):
-            add_row()
-    
+    if names is None:
+        names = [f"column {i}" for i in range(0, colcount)]
+    colcount = len(names)
+    if dtypes is None:
+        dtypes = ["str"] * colcount
+    # the data, rows only exist in the store, row widgets get reused
+    global first_row
+    global index
+    global view
+    global sort_spec
+    for name, dtype in zip(names, dtypes):
+        store.add_column(name, dtype)
+    store.add_rows(rowcount)
+    index = table_index.TableIndex(store)
+    view = None
+    sort_spec = None
+    first_row = 0
+    column_numbers.clear()
+    # create table with a vertical slider as scrollbar next to it
+    with dpg.group(parent="mainwindow", horizontal=True, tag=table_scope.add("table_group")):
+        with dpg.table(header_row=True, resizable=True, policy=dpg.mvTable_SizingStretchProp,
+                       borders_outerH=True, borders_innerV=True, borders_innerH=True, borders_outerV=True,
+                       tag=table_scope.add("maintable"), row_background=True, width=-40,
+                       sortable=True, callback=sort_table):
+
+            # add header columns, clicking a header sorts by it
+            for i, name in enumerate(store.names):
+                column = dpg.add_table_column(tag=table_scope.tag("col", i), label=name)
+                column_numbers[dpg.get_alias_id(column)] = i
+
+            # add row widgets
+            for i in range(0, min(rowcount, VISIBLE_ROWS)):
+                add_slot()
+        dpg.add_slider_int(tag=table_scope.add("table_scroll"), vertical=True, height=VISIBLE_ROWS * 24, width=30, format="",
+                           callback=scroll_slider)
+    refresh_rows()
+    # the filter can use every column
+    dpg.configure_item("filter_column", items=names)
+    dpg.set_value("filter_column", names[0])
+    dpg.set_value("filter_text", "")
+
     # update for user
     show_status_update(f"table with {colcount} columns and {rowcount} rows created!")
 
@@ -112,55 +255,259 @@ def create_table_btn():
     rowc = dpg.get_value("rowcount")
     colc = dpg.get_value("columncount")
 
+    # a running import would keep filling the new table
+    if isinstance(csv_job, table_csv.CsvReader):
+        cancel_csv_btn()
     # delete and create table
     delete_table()
     create_table(colcount=colc, rowcount=rowc)
 
+def update_view():
+    """Apply sort_spec and the filter in "filter_text" to the table.
+    The rows come from the indexes in index, the row widgets are only refreshed, never rebuilt.
+    """
+    global view
+    commit_edit()
+    apply_changes()
+    order = None
+    if sort_spec is not None:
+        order = index.sort_order(*sort_spec)
+    rows = None
+    text = dpg.get_value("filter_text")
+    if text:
+        rows = index.filter_rows(store.names.index(dpg.get_value("filter_column")), text,
+                                 prefix=dpg.get_value("filter_prefix"))
+    if order is not None and rows is not None:
+        # keep the sort order, drop the rows the filter did not find
+        keep = np.zeros(store.row_count, dtype=bool)
+        keep[rows] = True
+        view = order[keep[order]]
+    elif order is not None:
+        view = order
+    else:
+        view = rows
+    scroll_to(0)
+
+def sort_table(sender, app_data):
+    """Sort callback of "maintable", called when a header is clicked.
+
+    Args:
+        sender (obj): the table
+        app_data ([[int, int]]): sort specs, column id and direction (1 ascending, -1 descending)
+    """
+    global sort_spec
+    if not app_data:
+        sort_spec = None
+    else:
+        column, direction = app_data[0]
+        sort_spec = (column_numbers[column], direction < 0)
+    stime = time.perf_counter()
+    update_view()
+    show_status_update(f"sorted {row_count()} rows in {(time.perf_counter() - stime) * 1000:.1f} ms")
+
+def filter_table(sender, app_data):
+    """Callback of the filter widgets, filters the table on every keystroke."""
+    stime = time.perf_counter()
+    update_view()
+    show_status_update(f"filter found {row_count()} rows in {(time.perf_counter() - stime) * 1000:.1f} ms")
+
 def cell_edit(sender, app_data):
     """Click-handler. Function to enable editing in a table cell.
-    The function shows a status update to the user including tag and content of the clicked cell.
-    To achieve editing, the label within the table cell is removed and a text input widget is 
-    placed at the same position and updated with the same tag and content.
+    The function shows a status update to the user including row, column and content of the clicked cell.
+    To achieve editing, the single text input "cell_editor" is moved into the group of the clicked cell
+    and the label is hidden. commit_edit() moves it back once it loses focus, so editing never
+    creates or deletes widgets.
 
     Args:
         sender (obj): callback-sender
         app_data ([obj]): app_data
     """
-    # remember current cell for later
-    global current_cell
+    global editing
+    # look up the clicked cell in the index
     current_cell = app_data[1]
+    slot, column = widget_cells[current_cell]
+    # empty row widget after the last filtered row
+    if first_row + slot >= row_count():
+        return
+    # only one cell is edited at a time
+    commit_edit()
+    # the label shows the latest content, also if the change is not applied to store yet
+    cell_content = dpg.get_value(current_cell)
+    row = store_row(first_row + slot)
     # show clicked info to user
-    show_status_update(f"clicked on cell tag {app_data[1]}, content {dpg.get_value(app_data[1])}")
-    # store cell contents for later
-    cell_content = dpg.get_value(app_data[1])
-
-    # save current parent
-    parent = dpg.get_item_parent(current_cell)
-    # iterate cells in current row and save the position
-    cell_position = None
-    cell_before = None
-    for child in dpg.get_item_children(parent)[1]:
-        # if we saved a cell position, we can save the next one for the before-parameter
-        if cell_position:
-            cell_before = dpg.get_item_alias(child)
-            # escape to not overwrite any saved items
-            break
-        if dpg.get_item_alias(child) == current_cell:
-            cell_position = dpg.get_item_alias(child)
-    # delete current cell (meaning the label)
-    dpg.delete_item(current_cell)
-    # remove the alias if not already happened
-    if dpg.does_alias_exist(current_cell):
-        dpg.remove_alias(current_cell)
-    
-    # add an input text widget instead of the label one
-    # if we saved a "before"-position, attach it before that position
-    if cell_before:
-        dpg.add_input_text(tag=current_cell, parent=parent, before=cell_before)
-    else:
-        dpg.add_input_text(tag=current_cell, parent=parent)
-    dpg.set_value(current_cell, cell_content)
+    show_status_update(f"clicked on row {row} column {column}, content {cell_content}")
+
+    # put the editor in place of the label
+    dpg.move_item("cell_editor", parent=dpg.get_item_parent(current_cell), before=current_cell)
+    dpg.hide_item(current_cell)
+    dpg.set_value("cell_editor", cell_content)
+    dpg.show_item("cell_editor")
+    dpg.focus_item("cell_editor")
+    editing = (slot, column, row)
+
+def commit_edit(sender=None, app_data=None):
+    """Deactivation handler of "cell_editor", also called before the table scrolls or changes.
+    Moves the editor back to "editor_holder", shows the label with the new content and records the
+    change in pending_changes, apply_changes() writes it to store with the next batch.
+    """
+    global editing
+    if editing is None:
+        return
+    slot, column, row = editing
+    editing = None
+    cell = cell_widgets[slot][column]
+    text = dpg.get_value("cell_editor")
+    dpg.hide_item("cell_editor")
+    dpg.move_item("cell_editor", parent="editor_holder")
+    dpg.show_item(cell)
+    if text == dpg.get_value(cell):
+        return
+    try:
+        value = store.convert(column, text)
+    except ValueError:
+        show_status_update(f"column {column} only accepts numbers", color=(255, 0, 0, 255))
+        return
+    if isinstance(value, float):
+        text = table_store.format_value(value)
+    dpg.set_value(cell, text)
+    pending_changes.append((row, column, text))
+
+def apply_changes():
+    """Write the pending edits to store in one batch and add them to change_log.
+    Called once per frame and before anything reads store as a whole (sorting, filtering, export).
+    """
+    if not pending_changes:
+        return
+    old = store.set_many(pending_changes)
+    change_log.extend((row, column, before, text) for (row, column, text), before in zip(pending_changes, old))
+    pending_changes.clear()
+
+def import_csv_btn():
+    """Click-handler for the import button.
+    Deletes the table and starts parsing the file in "csv_file" on a background thread.
+    update_csv() creates the new table once the header is parsed and fills it frame by frame.
+    """
+    global csv_job
+    global store
+    if csv_job is not None:
+        csv_job.cancel()
+    try:
+        csv_job = table_csv.CsvReader(dpg.get_value("csv_file"))
+    except OSError as error:
+        csv_job = None
+        show_status_update(f"could not open file: {error}", color=(255, 0, 0, 255))
+        return
+    delete_table()
+    # imported cells without value stay empty instead of showing a default text
+    store = table_store.TableStore()
+    csv_job.start()
+    show_status_update(f"importing {csv_job.filename}")
+
+def export_csv_btn():
+    """Click-handler for the export button.
+    Writes the current table including edited cells to the file in "csv_file" on a background thread.
+    """
+    global csv_job
+    if csv_job is not None:
+        show_status_update("wait for the running import or export to finish", color=(255, 0, 0, 255))
+        return
+    commit_edit()
+    apply_changes()
+    csv_job = table_csv.CsvWriter(dpg.get_value("csv_file"), store)
+    csv_job.start()
+    show_status_update(f"exporting {store.row_count} rows to {csv_job.filename}")
 
+def create_csv_table(rows):
+    """Create the table of the running import from its header, the column types are guessed from rows.
+    Without header, e.g. if the file could not be read, the table gets one empty column, so adding rows,
+    sorting and filtering keep working.
+
+    Args:
+        rows ([[str]]): first parsed rows, may be empty
+    """
+    names = (csv_job.header or [])[:MAX_COLUMNS] or ["column 0"]
+    create_table(rowcount=0, names=names, dtypes=table_store.infer_dtypes(rows, len(names)))
+
+def cancel_csv_btn():
+    """Click-handler for the cancel button, stops the running import or export.
+    Rows imported so far stay in the table.
+    """
+    global csv_job
+    if csv_job is None:
+        return
+    csv_job.cancel()
+    # an import cancelled before its header was read has no table yet
+    if isinstance(csv_job, table_csv.CsvReader) and not dpg.does_item_exist("maintable"):
+        create_csv_table([])
+    show_status_update(f"cancelled after {csv_job.rows} rows", color=(255, 255, 0, 255))
+    csv_job = None
+    dpg.set_value("csv_progress", 0)
+    dpg.configure_item("csv_progress", overlay="")
+
+def update_csv():
+    """Called once per rendered frame. Shows the progress of the running import or export.
+    For imports, creates the table once the header and the first chunk are known and adds parsed
+    chunks to the table for at most CSV_FRAME_BUDGET seconds, the remaining chunks wait for the next frames.
+    Columns whose first chunk only holds numbers become float columns, they turn into text columns
+    again if a later chunk has text in them.
+    """
+    global csv_job
+    if csv_job is None:
+        return
+    if isinstance(csv_job, table_csv.CsvReader) and csv_job.header is not None:
+        chunk = None
+        if not dpg.does_item_exist("maintable"):
+            # read before taking the chunk, a finished reader has queued all its chunks
+            finished = csv_job.finished
+            chunk = csv_job.next_chunk()
+            if chunk is not None or finished:
+                create_csv_table(chunk or [])
+        added = 0
+        stime = time.perf_counter()
+        while dpg.does_item_exist("maintable") and time.perf_counter() - stime < CSV_FRAME_BUDGET:
+            if chunk is None:
+                chunk = csv_job.next_chunk()
+                if chunk is None:
+                    break
+            store.append_rows(chunk, widen=True)
+            added += len(chunk)
+            chunk = None
+        if added:
+            # only new row widgets up to VISIBLE_ROWS, the rows themselves are only data
+            while slots < min(store.row_count, VISIBLE_ROWS):
+                add_slot()
+            refresh_rows()
+
+    dpg.set_value("csv_progress", csv_job.progress)
+    dpg.configure_item("csv_progress", overlay=f"{csv_job.rows} rows")
+    if csv_job.error is not None:
+        # the file could not be read up to its header, the controls still need a table
+        if isinstance(csv_job, table_csv.CsvReader) and not dpg.does_item_exist("maintable"):
+            create_csv_table([])
+        show_status_update(f"CSV error after {csv_job.rows} rows: {csv_job.error}", color=(255, 0, 0, 255))
+        csv_job = None
+    elif csv_job.done:
+        if isinstance(csv_job, table_csv.CsvReader):
+            # rows imported after sorting or filtering are not in the view yet
+            if view is not None:
+                update_view()
+            show_status_update(f"imported {store.row_count} rows with {store.column_count} columns")
+        else:
+            show_status_update(f"exported {csv_job.rows} rows to {csv_job.filename}")
+        csv_job = None
+
+
+# one click handler registry shared by all cells
+with dpg.item_handler_registry(tag="cell_handler"):
+    dpg.add_item_clicked_handler(callback=cell_edit)
+
+# the editor commits when it loses focus
+with dpg.item_handler_registry(tag="editor_handler"):
+    dpg.add_item_deactivated_handler(callback=commit_edit)
+
+# scroll the table with the mouse wheel
+with dpg.handler_registry():
+    dpg.add_mouse_wheel_handler(callback=scroll_wheel)
 
 # create mainwindow
 with dpg.window(tag="mainwindow"):
@@ -169,6 +516,10 @@ with dpg.window(tag="mainwindow"):
     dpg.add_spacer()
     # text box for status updates
     dpg.add_text("current status: ", tag="status_text")
+    # the one cell editor, waits here hidden while no cell is edited
+    with dpg.group(tag="editor_holder", show=False):
+        dpg.add_input_text(tag="cell_editor", width=-1, show=False)
+    dpg.bind_item_handler_registry("cell_editor", "editor_handler")
 
     # controls for table creation
     # integer input field for column count between 1 and 50
@@ -181,6 +532,21 @@ with dpg.window(tag="mainwindow"):
 
     # buttons for table interaction / user_data is column count
     dpg.add_button(tag="add_row_button", label="add row", callback=add_row)
+    # filter box, filters the column selected in the combo on every keystroke
+    with dpg.group(horizontal=True):
+        dpg.add_input_text(tag="filter_text", label="filter", width=300, callback=filter_table)
+        dpg.add_combo(tag="filter_column", width=200, callback=filter_table)
+        dpg.add_checkbox(tag="filter_prefix", label="starts with", callback=filter_table)
+    # position of the visible rows in the table
+    dpg.add_text(tag="table_position")
+
+    # controls for CSV import and export, the first row of a CSV file is the header
+    dpg.add_input_text(tag="csv_file", label="CSV file", default_value="table.csv")
+    with dpg.group(horizontal=True):
+        dpg.add_button(tag="import_csv_button", label="import CSV", callback=import_csv_btn)
+        dpg.add_button(tag="export_csv_button", label="export CSV", callback=export_csv_btn)
+        dpg.add_button(tag="cancel_csv_button", label="cancel", callback=cancel_csv_btn)
+        dpg.add_progress_bar(tag="csv_progress", width=300)
 
     # create an example table with header
     create_table(4, 15)
@@ -192,5 +558,10 @@ dpg.show_viewport()
 #dpg.maximize_viewport()
 # set primary window to mainwindow
 dpg.set_primary_window("mainwindow", True)
-dpg.start_dearpygui()
+
+# instead of running start_dearpygui(), the frames are rendered manually to import CSV rows in between
+while dpg.is_dearpygui_running():
+    update_csv()
+    apply_changes()
+    dpg.render_dearpygui_frame()
 dpg.destroy_context()
@@ -0,0 +1,154 @@
+# streaming CSV import and export for the table example
+# files are parsed and written on background threads in chunks of rows, so neither a huge file
+# nor a huge table is ever held as one piece of text and the UI keeps rendering meanwhile
+
+import csv
+import io
+import os
+import queue
+import threading
+
+class CsvReader(threading.Thread):
+    """Parses a CSV file on a background thread. The first row is the header.
+    Parsed rows are handed over in chunks through a small queue, the UI takes them with
+    next_chunk() and appends them to its table. The queue is bounded, so parsing never runs
+    far ahead of the UI and memory stays at a few chunks.
+    """
+
+    def __init__(self, filename, chunk_rows=5000, max_chunks=8):
+        """
+        Args:
+            filename (str): path of the CSV file
+            chunk_rows (int, optional): rows per chunk. Defaults to 5000.
+            max_chunks (int, optional): chunks parsed ahead of the UI. Defaults to 8.
+        """
+        super().__init__(daemon=True)
+        self.filename = filename
+        self.chunk_rows = chunk_rows
+        self.total_bytes = os.path.getsize(filename)
+        self.read_bytes = 0
+        self.rows = 0
+        # column names, set before the first chunk is queued
+        self.header = None
+        self.error = None
+        self.finished = False
+        self._chunks = queue.Queue(max_chunks)
+        self._cancelled = False
+
+    @property
+    def progress(self):
+        """Fraction of the file parsed so far, between 0 and 1."""
+        return self.read_bytes / self.total_bytes if self.total_bytes else 1.0
+
+    def cancel(self):
+        """Stop parsing, the thread ends after the current chunk."""
+        self._cancelled = True
+
+    def next_chunk(self):
+        """Get the next parsed chunk without waiting.
+
+        Returns:
+            [[str]]: rows of the chunk, or None if no chunk is ready
+        """
+        try:
+            return self._chunks.get_nowait()
+        except queue.Empty:
+            return None
+
+    @property
+    def done(self):
+        """True once the whole file was parsed and every chunk was taken."""
+        return self.finished and self._chunks.empty()
+
+    def _put(self, chunk):
+        """Queue a chunk, waiting for the UI to take one if the queue is full.
+
+        Returns:
+            bool: False if the reader was cancelled while waiting
+        """
+        while not self._cancelled:
+            try:
+                self._chunks.put(chunk, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run(self):
+        try:
+            with open(self.filename, "rb") as raw:
+                text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                reader = csv.reader(text)
+                self.header = next(reader, [])
+                chunk = []
+                for row in reader:
+                    chunk.append(row)
+                    if len(chunk) == self.chunk_rows:
+                        # position of the underlying file, ahead of the parser by one buffer at most
+                        self.read_bytes = raw.tell()
+                        self.rows += len(chunk)
+                        if not self._put(chunk):
+                            return
+                        chunk = []
+                if chunk:
+                    self.rows += len(chunk)
+                    self._put(chunk)
+                self.read_bytes = self.total_bytes
+        except (OSError, UnicodeDecodeError, csv.Error) as error:
+            self.error = error
+        finally:
+            self.finished = True
+
+class CsvWriter(threading.Thread):
+    """Writes the content of a table_store.TableStore to a CSV file on a background thread.
+    The rows are read from the store in chunks and written right away, the file content is never
+    built in memory. Cells show the same text as the table, edited or not.
+    Rows added to the store while writing are not exported.
+    """
+
+    def __init__(self, filename, store, chunk_rows=5000):
+        """
+        Args:
+            filename (str): path of the CSV file
+            store (table_store.TableStore): table to export
+            chunk_rows (int, optional): rows read from the store at once. Defaults to 5000.
+        """
+        super().__init__(daemon=True)
+        self.filename = filename
+        self.store = store
+        self.chunk_rows = chunk_rows
+        self.total_rows = store.row_count
+        self.rows = 0
+        self.error = None
+        self.finished = False
+        self._cancelled = False
+
+    @property
+    def progress(self):
+        """Fraction of the rows written so far, between 0 and 1."""
+        return self.rows / self.total_rows if self.total_rows else 1.0
+
+    @property
+    def done(self):
+        return self.finished
+
+    def cancel(self):
+        """Stop writing, the file ends after the current chunk."""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            with open(self.filename, "w", encoding="utf-8", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(self.store.names)
+                for start in range(0, self.total_rows, self.chunk_rows):
+                    if self._cancelled:
+                        return
+                    stop = min(start + self.chunk_rows, self.total_rows)
+                    columns = [self.store.column_values(column, start, stop) for column in range(self.store.column_count)]
+                    writer.writerows(zip(*columns))
+                    self.rows = stop
+        except OSError as error:
+            self.error = error
+        finally:
+            self.finished = True
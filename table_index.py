@@ -0,0 +1,285 @@
+# sort and filter indexes for the table example
+# every column gets its sort permutations and search structures built once from the store,
+# afterwards sorting is a lookup and filtering only touches matching rows, no widget is read
+
+from bisect import bisect_left
+import re
+import numpy as np
+
+# sorts after every character, used as upper bound of prefix ranges
+_MAX_CHAR = "\U0010ffff"
+# separates the cells in the text searched for substrings, cells never contain it
+_SEPARATOR = "\0"
+# changed rows an index is updated with at least, more changes (or 1/16 of the rows) rebuild it
+_UPDATE_LIMIT = 4096
+
+class ColumnIndex:
+    """Indexes of one column of a table_store.TableStore, built lazily when first needed.
+    Matching is case-insensitive, the cells are compared by their lowercased text.
+    Later changes of the column are applied by update(), only the changed rows are looked at.
+    """
+
+    def __init__(self, store, column):
+        """
+        Args:
+            store (table_store.TableStore): table data
+            column (int): column to index
+        """
+        self.column = column
+        self.version = store.versions[column]
+        self.keys = [text.lower() for text in store.column_values(column)]
+        if store.dtypes[column] == "float":
+            # a copy, a view of the array("d") would keep the store from adding rows
+            self._numbers = np.array(store.columns[column], dtype=np.float64)
+        else:
+            self._numbers = None
+        # rows in sort order and, if sorted by value, the value of every row
+        self._order = None
+        self._order_numbers = None
+        self._text_order = None
+        self._text = None
+        self._starts = None
+        # rows changed or added since _text was built, they are checked one by one
+        self._dirty = set()
+
+    @property
+    def order(self):
+        """Rows in ascending order of the column. Numbers are sorted by value, also in text
+        columns where every cell is a number, everything else alphabetically.
+        """
+        if self._order is None:
+            numbers = self._numbers
+            if numbers is None:
+                try:
+                    numbers = np.array(self.keys, dtype=np.float64)
+                except ValueError:
+                    numbers = None
+            if numbers is None:
+                self._order = self.text_order
+            else:
+                self._order = np.argsort(numbers, kind="stable")
+                self._order_numbers = numbers
+        return self._order
+
+    @property
+    def text_order(self):
+        """Rows in alphabetical order of the column, prefix matches are a slice of it."""
+        if self._text_order is None:
+            self._text_order = np.array(sorted(range(len(self.keys)), key=self.keys.__getitem__), dtype=np.int64)
+        return self._text_order
+
+    def prefix_rows(self, prefix):
+        """Rows whose cell starts with prefix, found by binary search in the alphabetical order.
+
+        Args:
+            prefix (str): lowercased prefix
+
+        Returns:
+            numpy.ndarray: ascending row numbers
+        """
+        order = self.text_order
+        key = self.keys.__getitem__
+        lo = bisect_left(order, prefix, key=key)
+        hi = bisect_left(order, prefix + _MAX_CHAR, lo, key=key)
+        return np.sort(order[lo:hi])
+
+    def substring_rows(self, text):
+        """Rows whose cell contains text. All cells are searched as one string, so the search
+        itself runs in C and only matches are handled in Python.
+
+        Args:
+            text (str): lowercased text
+
+        Returns:
+            numpy.ndarray: ascending row numbers
+        """
+        if self._text is None:
+            self._text = _SEPARATOR.join(self.keys)
+            lengths = np.fromiter(map(len, self.keys), dtype=np.int64, count=len(self.keys))
+            self._starts = np.zeros(len(self.keys), dtype=np.int64)
+            np.cumsum(lengths[:-1] + 1, out=self._starts[1:])
+            self._dirty.clear()
+        positions = np.fromiter((match.start() for match in re.finditer(re.escape(text), self._text)), dtype=np.int64)
+        rows = np.unique(np.searchsorted(self._starts, positions, "right") - 1)
+        if not self._dirty:
+            return rows
+        # the joined text still has the old content of changed rows
+        dirty = np.fromiter(self._dirty, dtype=np.int64, count=len(self._dirty))
+        matches = np.fromiter((row for row in self._dirty if text in self.keys[row]), dtype=np.int64)
+        return np.union1d(rows[~np.isin(rows, dirty)], matches)
+
+    def update(self, store):
+        """Apply the changes of the column since the index was built (or last updated).
+        Keys and values are replaced for the changed rows only, the sort orders get the changed
+        rows removed and inserted again at their new positions, all in one pass per order.
+
+        Args:
+            store (table_store.TableStore): table data the index was built from
+
+        Returns:
+            bool: False if the changes are unknown or too many, the index has to be built again then
+        """
+        rows = store.changed_rows(self.column, self.version)
+        if rows is None:
+            return False
+        old_count = len(self.keys)
+        # rows added since then count as added, even if they were changed afterwards
+        rows = sorted(row for row in set(rows) if row < old_count)
+        added = range(old_count, store.row_count)
+        if len(rows) + len(added) > max(_UPDATE_LIMIT, old_count // 16):
+            return False
+        numeric_order = self._order is not None and self._order is not self._text_order
+        changed = rows + list(added)
+
+        # positions of the changed rows in the orders, looked up with their old keys and values
+        if self._text_order is not None:
+            text_positions = [self._text_position(row) for row in rows]
+        if numeric_order:
+            number_positions = [self._number_position(row) for row in rows]
+
+        # new keys and values
+        for row in rows:
+            self.keys[row] = store.get(row, self.column).lower()
+        self.keys.extend(store.get(row, self.column).lower() for row in added)
+        if self._numbers is not None:
+            values = store.columns[self.column]
+            self._numbers[rows] = [values[row] for row in rows]
+            self._numbers = np.append(self._numbers, np.array(values[old_count:], dtype=np.float64))
+        if numeric_order:
+            if self._numbers is not None:
+                self._order_numbers = self._numbers
+            else:
+                try:
+                    numbers = [float(self.keys[row]) for row in changed]
+                except ValueError:
+                    # not every cell is a number anymore, sort alphabetically from now on
+                    numeric_order = False
+                    self._order = None
+                    self._order_numbers = None
+                else:
+                    self._order_numbers[rows] = numbers[:len(rows)]
+                    self._order_numbers = np.append(self._order_numbers, numbers[len(rows):])
+        elif self._order is not None and self._order is self._text_order and self._numbers is None:
+            # sorted alphabetically because of a cell that was not a number, if the changed cells are
+            # numbers that cell may be gone, the order property checks the whole column again
+            try:
+                for row in changed:
+                    float(self.keys[row])
+            except ValueError:
+                pass
+            else:
+                self._order = None
+
+        # take the changed rows out and insert them at their new positions
+        if self._text_order is not None:
+            order = np.delete(self._text_order, text_positions)
+            key = lambda row: (self.keys[row], row)
+            positions = [bisect_left(order, (self.keys[row], row), key=key) for row in changed]
+            text_order = _insert(order, positions, changed, key)
+            if self._order is self._text_order:
+                self._order = text_order
+            self._text_order = text_order
+        if numeric_order:
+            order = np.delete(self._order, number_positions)
+            positions = [bisect_left(order, self._number_key(row), key=self._number_key) for row in changed]
+            self._order = _insert(order, positions, changed, self._number_key)
+
+        if self._text is not None:
+            self._dirty.update(changed)
+            if len(self._dirty) > _UPDATE_LIMIT:
+                self._text = None
+        self.version = store.versions[self.column]
+        return True
+
+    def _number_key(self, row):
+        """Sort key of a row in the order by value: NaN after all numbers, equal values by row."""
+        value = self._order_numbers[row]
+        return (True, 0.0, row) if value != value else (False, value, row)
+
+    def _number_position(self, row):
+        """Position of a row in the order by value, with its current value."""
+        return bisect_left(self._order, self._number_key(row), key=self._number_key)
+
+    def _text_position(self, row):
+        """Position of a row in the alphabetical order, with its current key."""
+        return bisect_left(self._text_order, (self.keys[row], row), key=lambda other: (self.keys[other], other))
+
+def _insert(order, positions, rows, key):
+    """Insert rows into an order at positions (of the order without them), rows with the same
+    position are put in the order of their sort keys.
+    """
+    # np.insert puts values with the same position in the order they are given
+    pairs = sorted(zip(positions, map(key, rows), rows))
+    return np.insert(order, [pair[0] for pair in pairs], [pair[2] for pair in pairs])
+
+class TableIndex:
+    """Sort and filter access to a table_store.TableStore. Column indexes are cached until their
+    column changes, the last filter result is reused when the filter text only gets longer.
+    """
+
+    def __init__(self, store):
+        """
+        Args:
+            store (table_store.TableStore): table data
+        """
+        self.store = store
+        self._columns = {}
+        # (column, prefix, text, version, rows) of the last filter
+        self._last_filter = None
+
+    def column(self, column):
+        """Index of a column, updated if the column changed since it was built.
+
+        Args:
+            column (int): column number
+
+        Returns:
+            ColumnIndex: index of the column
+        """
+        index = self._columns.get(column)
+        if index is None or (index.version != self.store.versions[column] and not index.update(self.store)):
+            index = ColumnIndex(self.store, column)
+            self._columns[column] = index
+        return index
+
+    def sort_order(self, column, descending=False):
+        """Rows in the order of a column.
+
+        Args:
+            column (int): column to sort by
+            descending (bool, optional): biggest first. Defaults to False.
+
+        Returns:
+            numpy.ndarray: row numbers
+        """
+        order = self.column(column).order
+        return order[::-1] if descending else order
+
+    def filter_rows(self, column, text, prefix=False):
+        """Rows whose cell in column contains text (or starts with it), ignoring case.
+        If the previous filter was on the same unchanged column and text extends its text,
+        only the previous matches are checked.
+
+        Args:
+            column (int): column to filter
+            text (str): text to look for
+            prefix (bool, optional): only match at the start of the cell. Defaults to False.
+
+        Returns:
+            numpy.ndarray: ascending row numbers
+        """
+        text = text.lower()
+        if not text:
+            self._last_filter = None
+            return np.arange(self.store.row_count, dtype=np.int64)
+        index = self.column(column)
+        last = self._last_filter
+        if prefix:
+            rows = index.prefix_rows(text)
+        elif last is not None and last[:2] == (column, prefix) and last[3] == index.version and text.startswith(last[2]):
+            keys = index.keys
+            rows = np.array([row for row in last[4].tolist() if text in keys[row]], dtype=np.int64)
+        else:
+            rows = index.substring_rows(text)
+        self._last_filter = (column, prefix, text, index.version, rows)
+        return rows
@@ -0,0 +1,312 @@
+# columnar backing store for the table example
+# the table widgets only show what is stored here, every cell is reached by (row, column)
+# in constant time no matter how many rows the table has
+
+from array import array
+import math
+
+# supported column types: text is kept in a list, numbers in a typed float array
+DTYPES = ["str", "float"]
+# changes remembered per column for changed_rows(), indexes older than that are rebuilt
+HISTORY_LENGTH = 1024
+
+def format_value(value):
+    """Format a stored float for display, whole numbers without decimals and NaN as empty cell.
+
+    Args:
+        value (float): stored value
+
+    Returns:
+        str: text for the cell
+    """
+    if math.isnan(value):
+        return ""
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+def _exact_float(text):
+    """Convert the text of a cell to a float that format_value() turns back into the same text.
+
+    Args:
+        text (str): value from a file, None or empty for an empty cell
+
+    Returns:
+        float: the number, NaN for an empty cell
+
+    Raises:
+        ValueError: if text is not a number or would be shown differently, e.g. "007", "1.50" or "NaN"
+    """
+    if text is None or text == "":
+        return math.nan
+    value = float(text)
+    # NaN is shown as empty cell
+    if text.lower() == "nan" or format_value(value) != text:
+        raise ValueError(f"{text!r} would change as a number")
+    return value
+
+def infer_dtypes(rows, count):
+    """Guess the column types of rows of text, e.g. the first rows of a CSV file.
+    A column becomes a float column if it has values and every value is a number written the way
+    format_value() writes it, so importing and exporting a file never changes its content.
+    Other number columns stay text, they are still sorted by value.
+
+    Args:
+        rows ([[str]]): sample rows, shorter rows count as empty at the end
+        count (int): number of columns
+
+    Returns:
+        [str]: one of DTYPES per column
+    """
+    dtypes = []
+    for column in range(count):
+        values = [row[column] for row in rows if column < len(row) and row[column] != ""]
+        try:
+            for value in values:
+                _exact_float(value)
+        except ValueError:
+            dtypes.append("str")
+        else:
+            dtypes.append("float" if values else "str")
+    return dtypes
+
+class TableStore:
+    """Table data stored column by column.
+    Text columns are lists, where None marks a cell that was never set and shows the default text.
+    Float columns are array("d"), where NaN marks an empty cell.
+    """
+
+    def __init__(self, default=None):
+        """
+        Args:
+            default (function, optional): default(row, column) returns the text of cells that were
+                                          never set. Defaults to None for empty cells.
+        """
+        self.default = default
+        self.names = []
+        self.dtypes = []
+        self.columns = []
+        # change counter per column, indexes built from a column compare it to know if they are stale
+        self.versions = []
+        # per column the (version, rows) of its latest changes, rows added at the end are not listed
+        self._history = []
+        self.row_count = 0
+
+    @property
+    def column_count(self):
+        return len(self.columns)
+
+    def add_column(self, name, dtype="str"):
+        """Add a column, existing rows get an unset cell in it.
+
+        Args:
+            name (str): column name shown in the header
+            dtype (str, optional): one of DTYPES. Defaults to "str".
+        """
+        if dtype == "str":
+            column = [None] * self.row_count
+        elif dtype == "float":
+            column = array("d", [math.nan]) * self.row_count
+        else:
+            raise ValueError(f"unknown column type {dtype}")
+        self.names.append(name)
+        self.dtypes.append(dtype)
+        self.columns.append(column)
+        self.versions.append(0)
+        self._history.append([])
+
+    def _changed(self, column, rows):
+        """Count a change of column and remember its rows.
+
+        Args:
+            column (int): changed column
+            rows ([int]): changed rows, empty if rows were only added
+        """
+        self.versions[column] += 1
+        history = self._history[column]
+        history.append((self.versions[column], rows))
+        if len(history) > HISTORY_LENGTH:
+            del history[:len(history) // 2]
+
+    def changed_rows(self, column, version):
+        """Rows of a column changed since a version, for indexes that update themselves instead of
+        being rebuilt. Rows added since then are not listed, they follow the previous row count.
+
+        Args:
+            column (int): column
+            version (int): version the caller knows
+
+        Returns:
+            [int]: changed rows, possibly repeated, None if the changes are not remembered anymore
+        """
+        history = self._history[column]
+        if version == self.versions[column]:
+            return []
+        if not history or history[0][0] > version + 1:
+            return None
+        rows = []
+        for changed_version, changed in history:
+            if changed_version > version:
+                rows.extend(changed)
+        return rows
+
+    def add_rows(self, count):
+        """Append count rows with unset cells.
+
+        Args:
+            count (int): number of rows to add
+        """
+        for dtype, column in zip(self.dtypes, self.columns):
+            if dtype == "str":
+                column.extend([None] * count)
+            else:
+                column.extend(array("d", [math.nan]) * count)
+        self.row_count += count
+        for column in range(self.column_count):
+            self._changed(column, [])
+
+    def append_rows(self, rows, widen=False):
+        """Append rows of text values, converted to the type of each column.
+        Nothing is appended if a value does not fit its column.
+
+        Args:
+            rows ([[str]]): one list of values per row, missing values at the end stay unset
+            widen (bool, optional): turn float columns into text columns when a value is not a number
+                                    or would change as a number (see infer_dtypes()) instead of failing.
+                                    Defaults to False.
+
+        Raises:
+            ValueError: if a value does not fit the type of its column and widen is False
+        """
+        rows = list(rows)
+        # convert every column first, so a bad value leaves all columns as they were
+        converted = []
+        for column_index, dtype in enumerate(self.dtypes):
+            values = [row[column_index] if column_index < len(row) else None for row in rows]
+            if dtype == "float":
+                try:
+                    if widen:
+                        values = array("d", map(_exact_float, values))
+                    else:
+                        values = array("d", (math.nan if value in (None, "") else float(value) for value in values))
+                except ValueError:
+                    if not widen:
+                        raise
+                    self._to_text(column_index)
+            converted.append(values)
+        for column, values in zip(self.columns, converted):
+            column.extend(values)
+        self.row_count += len(rows)
+        for column in range(self.column_count):
+            self._changed(column, [])
+
+    def _to_text(self, column):
+        """Turn a float column into a text column with the same cell texts, empty cells stay unset.
+
+        Args:
+            column (int): float column
+        """
+        self.columns[column] = [None if value != value else format_value(value) for value in self.columns[column]]
+        self.dtypes[column] = "str"
+        # every row changed, indexes of the column have to be built again
+        self.versions[column] += 1
+        self._history[column] = []
+
+    def get(self, row, column):
+        """Text of one cell.
+
+        Args:
+            row (int): row of the cell
+            column (int): column of the cell
+
+        Returns:
+            str: text of the cell
+        """
+        value = self.columns[column][row]
+        if self.dtypes[column] == "float":
+            return format_value(value)
+        if value is None:
+            return self.default(row, column) if self.default else ""
+        return value
+
+    def convert(self, column, text):
+        """Convert text to the value stored in a column.
+
+        Args:
+            column (int): column the text is meant for
+            text (str): content
+
+        Returns:
+            str or float: value as stored
+
+        Raises:
+            ValueError: if text is not a number but the column is a float column
+        """
+        if self.dtypes[column] == "float":
+            return math.nan if text == "" else float(text)
+        return text
+
+    def set(self, row, column, text):
+        """Set one cell from its text.
+
+        Args:
+            row (int): row of the cell
+            column (int): column of the cell
+            text (str): new content
+
+        Raises:
+            ValueError: if text is not a number but the column is a float column
+        """
+        self.columns[column][row] = self.convert(column, text)
+        self._changed(column, [row])
+
+    def set_many(self, changes):
+        """Set a batch of cells, every changed column counts as changed once.
+
+        Args:
+            changes ([(int, int, str)]): row, column and new content of every cell
+
+        Returns:
+            [str]: previous content of every cell
+
+        Raises:
+            ValueError: if a text is not a number but its column is a float column,
+                        the changes before it are applied
+        """
+        old = []
+        changed = {}
+        try:
+            for row, column, text in changes:
+                value = self.convert(column, text)
+                old.append(self.get(row, column))
+                self.columns[column][row] = value
+                changed.setdefault(column, []).append(row)
+        finally:
+            for column, rows in changed.items():
+                self._changed(column, rows)
+        return old
+
+    def row_values(self, row):
+        """Text of all cells of one row.
+
+        Args:
+            row (int): row to read
+
+        Returns:
+            [str]: one text per column
+        """
+        return [self.get(row, column) for column in range(self.column_count)]
+
+    def column_values(self, column, start=0, stop=None):
+        """Text of the cells of one column.
+
+        Args:
+            column (int): column to read
+            start (int, optional): first row. Defaults to 0.
+            stop (int, optional): row after the last one. Defaults to all rows.
+
+        Returns:
+            [str]: one text per row
+        """
+        stop = self.row_count if stop is None else stop
+        return [self.get(row, column) for row in range(start, stop)]
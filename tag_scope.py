@@ -0,0 +1,61 @@
+# scoped tags for the Dear PyGui examples
+# a scope remembers every item and tag created through it, so a whole component (a table,
+# a set of plots, a drawing) can be deleted without looking at the rest of the application:
+# teardown only touches the scope's own items and stays fast no matter how many other items exist
+
+import dearpygui.dearpygui as dpg
+
+class TagScope:
+    """Records the items of one component and deletes them together.
+    Tags made by tag() are prefixed with the scope name, so two scopes never share a tag.
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): prefix of all tags made by this scope
+        """
+        self.name = name
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def tag(self, *parts):
+        """Make a tag inside this scope and record it. The item has to be created with it.
+
+        Args:
+            parts ([obj]): parts of the tag, joined with "_" after the scope name
+
+        Returns:
+            str: tag like "{name}_{part}_{part}"
+        """
+        tag = "_".join([self.name, *(str(part) for part in parts)])
+        self.items.append(tag)
+        return tag
+
+    def add(self, item):
+        """Record an item created without a scope tag, e.g. a drawing without tag or a fixed tag.
+
+        Args:
+            item (int or str): id or tag of the item
+
+        Returns:
+            int or str: item, so the call can wrap the creating function
+        """
+        self.items.append(item)
+        return item
+
+    def delete(self):
+        """Delete all recorded items and remove their aliases, then forget them.
+        Items are deleted in the order they were recorded, so children that were already deleted
+        together with their parent are skipped.
+        Since DearPyGui sometimes does not remove an alias upon deletion, aliases are removed explicitly,
+        otherwise creating an item with the same tag again fails.
+        """
+        for item in self.items:
+            if dpg.does_item_exist(item):
+                dpg.delete_item(item)
+            if isinstance(item, str) and dpg.does_alias_exist(item):
+                dpg.remove_alias(item)
+        self.items.clear()
@@ -0,0 +1,5 @@
+# the examples are plain modules in the repository root, make them importable from the tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+# tests of table_index: indexes updated after edits have to match indexes built from scratch
+
+import random
+import numpy as np
+import table_index
+import table_store
+
+def make_store(values):
+    store = table_store.TableStore()
+    store.add_column("a")
+    store.append_rows([[value] for value in values])
+    return store
+
+def assert_same(index, store):
+    fresh = table_index.ColumnIndex(store, 0)
+    updated = index.column(0)
+    assert np.array_equal(updated.order, fresh.order)
+    assert np.array_equal(updated.text_order, fresh.text_order)
+
+def test_edit_makes_column_numeric():
+    store = make_store(["10", "9", "abc"])
+    index = table_index.TableIndex(store)
+    assert index.sort_order(0).tolist() == [0, 1, 2]
+    store.set_many([(2, 0, "8")])
+    assert index.sort_order(0).tolist() == [2, 1, 0]
+    assert_same(index, store)
+
+def test_edit_makes_column_text():
+    store = make_store(["10", "9", "8"])
+    index = table_index.TableIndex(store)
+    assert index.sort_order(0).tolist() == [2, 1, 0]
+    store.set(1, 0, "abc")
+    assert index.sort_order(0).tolist() == [0, 2, 1]
+    assert_same(index, store)
+
+def test_random_edits_flip_numeric_and_text():
+    rng = random.Random(1)
+    store = make_store([str(rng.randint(0, 50)) for _ in range(30)])
+    index = table_index.TableIndex(store)
+    for _ in range(300):
+        index.sort_order(0)
+        index.filter_rows(0, "1")
+        changes = []
+        for _ in range(rng.randint(1, 3)):
+            row = rng.randrange(store.row_count)
+            # mostly numbers, now and then a word that makes the column sort alphabetically
+            text = rng.choice(["abc", "x"]) if rng.random() < 0.1 else str(rng.randint(0, 50))
+            changes.append((row, 0, text))
+        store.set_many(changes)
+        if rng.random() < 0.1:
+            store.append_rows([[str(rng.randint(0, 50))]])
+        assert_same(index, store)
+        assert index.filter_rows(0, "1").tolist() == [row for row in range(store.row_count) if "1" in store.get(row, 0)]
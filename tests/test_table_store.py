@@ -0,0 +1,41 @@
+# tests of table_store: imported CSV files have to be exported unchanged
+
+import table_csv
+import table_store
+
+def round_trip(tmp_path, text, chunk_rows=5000):
+    """Import a CSV file the way the table example does and export it again."""
+    source = tmp_path / "source.csv"
+    source.write_text(text, encoding="utf-8", newline="")
+    reader = table_csv.CsvReader(str(source), chunk_rows=chunk_rows, max_chunks=100)
+    reader.run()
+    chunks = []
+    while (chunk := reader.next_chunk()) is not None:
+        chunks.append(chunk)
+    store = table_store.TableStore()
+    for name, dtype in zip(reader.header, table_store.infer_dtypes(chunks[0], len(reader.header))):
+        store.add_column(name, dtype)
+    for chunk in chunks:
+        store.append_rows(chunk, widen=True)
+    target = tmp_path / "target.csv"
+    writer = table_csv.CsvWriter(str(target), store)
+    writer.run()
+    with open(target, encoding="utf-8", newline="") as exported:
+        return store, exported.read()
+
+def test_infer_dtypes():
+    rows = [["01234", "1.50", "NaN", "1", "2.5", "x"], ["00042", "2.00", "1", "-3", "", "1"]]
+    assert table_store.infer_dtypes(rows, 7) == ["str", "str", "str", "float", "float", "str", "str"]
+
+def test_round_trip_keeps_number_text(tmp_path):
+    text = "zip,price,ratio,count,share\r\n01234,1.50,NaN,1,0.25\r\n00042,2.00,1,-3,\r\n"
+    store, exported = round_trip(tmp_path, text)
+    assert store.dtypes == ["str", "str", "str", "float", "float"]
+    assert exported == text
+
+def test_round_trip_widens_later_chunks(tmp_path):
+    # the first chunk only has plain numbers, the second one has text and padded numbers
+    text = "a,b\r\n1,2\r\n3,4\r\n5,007\r\nx,6\r\n"
+    store, exported = round_trip(tmp_path, text, chunk_rows=2)
+    assert store.dtypes == ["str", "str"]
+    assert exported == text